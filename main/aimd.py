@@ -0,0 +1,136 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+import http_client
+import telemetry
+
+INITIAL_WINDOW = 4
+MIN_WINDOW = 1
+MAX_WINDOW = 32
+
+# responses that mean the server wants us to slow down
+THROTTLE_STATUSES = {429, 503}
+
+# a request counts as "latency flat" while it is within this factor of the baseline
+LATENCY_TOLERANCE = 2.0
+DECREASE_FACTOR = 0.5
+
+
+class AimdController:
+    """
+    Adaptive concurrency window for one host. Every fast successful request
+    grows the window by 1/window (about +1 per window of requests), a
+    throttling response or timeout halves it, and requests are held back
+    while the window is full. Worker pools using it should be sized to
+    MAX_WINDOW and let the window decide how many actually run.
+    """
+
+    def __init__(self, host, initial=INITIAL_WINDOW, minimum=MIN_WINDOW, maximum=MAX_WINDOW):
+        self.host = host
+        self.window = float(initial)
+        self.minimum = minimum
+        self.maximum = maximum
+        self.in_flight = 0
+        self.baseline = None
+        self.last_decrease = 0.0
+        self.condition = threading.Condition()
+
+    def acquire(self):
+        with self.condition:
+            while self.in_flight >= int(self.window):
+                self.condition.wait()
+            self.in_flight += 1
+
+    def release(self, latency=None, throttled=False):
+        with self.condition:
+            self.in_flight -= 1
+            self.adjust(latency, throttled)
+            self.condition.notify_all()
+
+    def adjust(self, latency=None, throttled=False):
+        """
+        Grows or shrinks the window after one request; the caller holds the
+        controller's lock, if it has one.
+        """
+        old = int(self.window)
+        if throttled:
+            # one backoff per round trip, not one per failed request in flight
+            cooldown = self.baseline or 1.0
+            if time.monotonic() - self.last_decrease >= cooldown:
+                self.window = max(self.minimum, self.window * DECREASE_FACTOR)
+                self.last_decrease = time.monotonic()
+        elif latency is not None:
+            if self.baseline is None:
+                self.baseline = latency
+            if latency <= self.baseline * LATENCY_TOLERANCE:
+                self.window = min(self.maximum, self.window + 1 / self.window)
+            self.baseline = 0.9 * self.baseline + 0.1 * latency
+        if int(self.window) != old:
+            reason = "throttled" if throttled else f"latency {latency:.2f}s"
+            print(f"[aimd] {self.host}: window {old} -> {int(self.window)} ({reason})")
+
+
+class AsyncAimdController(AimdController):
+    """
+    AimdController for coroutines on one event loop (see crawl.Crawler):
+    acquire waits for room in the window without blocking the loop.
+    """
+
+    def __init__(self, host, initial=INITIAL_WINDOW, minimum=MIN_WINDOW, maximum=MAX_WINDOW):
+        super().__init__(host, initial, minimum, maximum)
+        self.waiters = []
+
+    async def acquire(self):
+        while self.in_flight >= int(self.window):
+            waiter = asyncio.get_running_loop().create_future()
+            self.waiters.append(waiter)
+            await waiter
+        self.in_flight += 1
+
+    def release(self, latency=None, throttled=False):
+        self.in_flight -= 1
+        self.adjust(latency, throttled)
+        # like notify_all: every waiter checks the window again
+        waiters, self.waiters = self.waiters, []
+        for waiter in waiters:
+            if not waiter.done():
+                waiter.set_result(None)
+
+
+_controllers = {}
+_lock = threading.Lock()
+
+
+def controller_for(url):
+    host = urlparse(url).hostname or ""
+    with _lock:
+        if host not in _controllers:
+            _controllers[host] = AimdController(host)
+        return _controllers[host]
+
+
+def get(url, **kwargs):
+    """
+    http_client.get under the host's adaptive concurrency window. Fresh
+    cached pages skip the window.
+    """
+    response = http_client.get_fresh(url, **kwargs)
+    if response is not None:
+        return response
+    controller = controller_for(url)
+    waiting = time.monotonic()
+    controller.acquire()
+    start = time.monotonic()
+    telemetry.observe("crawl_wait_seconds", start - waiting, host=controller.host)
+    try:
+        response = http_client.get(url, **kwargs)
+    except (requests.Timeout, requests.ConnectionError):
+        controller.release(throttled=True)
+        raise
+    except Exception:
+        controller.release()
+        raise
+    controller.release(time.monotonic() - start, response.status_code in THROTTLE_STATUSES)
+    return response
@@ -0,0 +1,141 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import requests
+from requests.structures import CaseInsensitiveDict
+
+ARCHIVE_DIR = "archive"
+
+# start a new pack file once the current one is this large
+PACK_SIZE = 256 * 1024 * 1024
+
+
+class NotArchived(requests.RequestException):
+    """
+    Raised when an offline run asks for a page that was never archived.
+    """
+
+
+class PageArchive:
+    """
+    Append-only archive of every page fetched. Bodies are zlib-compressed and
+    appended to pack files under packs/; index.sqlite records where each
+    version lives. Nothing is ever overwritten: a page that changes gets a
+    new record, an unchanged one is not stored twice. Each process appends
+    to its own pack, so sharded runs can share one archive. Pages that were
+    a 404 are recorded too, with their status and no body, so offline runs
+    see them missing the same way the crawl did.
+    """
+
+    def __init__(self, path=ARCHIVE_DIR, pack_size=PACK_SIZE):
+        self.path = path
+        self.pack_size = pack_size
+        self.lock = threading.Lock()
+        self.pack = None
+        self.pack_file = None
+        os.makedirs(os.path.join(path, "packs"), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(path, "index.sqlite"), timeout=30, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "id INTEGER PRIMARY KEY, url TEXT NOT NULL, final_url TEXT NOT NULL, "
+            "headers TEXT NOT NULL, digest TEXT NOT NULL, fetched_at REAL NOT NULL, "
+            "pack TEXT NOT NULL, offset INTEGER NOT NULL, length INTEGER NOT NULL)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS pages_url ON pages (url, id)")
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(pages)")]
+        if "status" not in columns:
+            self.conn.execute("ALTER TABLE pages ADD COLUMN status INTEGER NOT NULL DEFAULT 200")
+        self.conn.commit()
+
+    def _open_pack(self):
+        if self.pack_file is None or self.pack_file.tell() >= self.pack_size:
+            if self.pack_file is not None:
+                self.pack_file.close()
+            self.pack = f"pages-{time.strftime('%Y%m%d-%H%M%S')}-{os.getpid()}.pack"
+            self.pack_file = open(os.path.join(self.path, "packs", self.pack), "ab")
+        return self.pack_file
+
+    def latest(self, url):
+        """
+        Returns the newest record for url, or None.
+        """
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT final_url, headers, digest, fetched_at, pack, offset, length, status "
+                "FROM pages WHERE url = ? ORDER BY id DESC LIMIT 1", (url,)
+            ).fetchone()
+        if row is None:
+            return None
+        keys = ["final_url", "headers", "digest", "fetched_at", "pack", "offset", "length", "status"]
+        return dict(zip(keys, row))
+
+    def append(self, url, response):
+        """
+        Archives a fetched response under url (the request URL with params),
+        unless it is the same as the newest version already archived. Only
+        a 200's body is kept; for anything else just the status is recorded.
+        """
+        body = response.content if response.status_code == 200 else b""
+        digest = hashlib.sha256(body).hexdigest()
+        latest = self.latest(url)
+        if latest is not None and latest["digest"] == digest and latest["status"] == response.status_code:
+            return
+        with self.lock:
+            pack, offset, length = "", 0, 0
+            if response.status_code == 200:
+                compressed = zlib.compress(body)
+                pack_file = self._open_pack()
+                pack, offset, length = self.pack, pack_file.tell(), len(compressed)
+                pack_file.write(compressed)
+                pack_file.flush()
+            self.conn.execute(
+                "INSERT INTO pages (url, final_url, headers, digest, fetched_at, pack, offset, length, status) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, response.url, json.dumps(dict(response.headers)), digest, time.time(),
+                 pack, offset, length, response.status_code),
+            )
+            self.conn.commit()
+
+    def read(self, record):
+        if not record["pack"]:
+            return b""
+        with open(os.path.join(self.path, "packs", record["pack"]), "rb") as f:
+            f.seek(record["offset"])
+            return zlib.decompress(f.read(record["length"]))
+
+    def build_response(self, record):
+        """
+        Rebuilds a requests.Response from an archive record.
+        """
+        response = requests.Response()
+        response.status_code = record["status"]
+        response._content = self.read(record)
+        response.headers = CaseInsensitiveDict(json.loads(record["headers"]))
+        response.url = record["final_url"]
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def urls(self, containing=""):
+        """
+        Every archived URL containing the given substring, in first-fetched order.
+        """
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT url FROM pages WHERE instr(url, ?) > 0 GROUP BY url ORDER BY MIN(id)", (containing,)
+            ).fetchall()
+        return [url for (url,) in rows]
+
+    def summary(self):
+        with self.lock:
+            pages, urls = self.conn.execute("SELECT COUNT(*), COUNT(DISTINCT url) FROM pages").fetchone()
+        return f"page archive: {pages} versions of {urls} pages"
+
+    def close(self):
+        with self.lock:
+            if self.pack_file is not None:
+                self.pack_file.close()
+            self.conn.close()
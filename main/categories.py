@@ -0,0 +1,94 @@
+# keyword lists deciding which papers are kept, and under which category;
+# shared by every venue
+KEYWORDS = {
+    "Transparency & Explainability": [
+        'Algorithmic Transparency',
+        'Explainable AI',
+        'Explainable Artificial Intelligence',
+        'XAI',
+        'Interpretability',
+        'Model Explainability',
+        'Explainability',
+        'Transparency',
+        'Human-understandable decisions',
+        'Audit',
+        'Auditing',
+        'Outcome explanation',
+        'Causality',
+        'Causal reasoning',
+        'Interpretable models',
+        'Explainable models',
+    ],
+    "Fairness & Bias": [
+        'Algorithmic Fairness',
+        'Bias Detection',
+        'Bias',
+        'Discrimination',
+        'Fair ML',
+        'Fair Machine Learning',
+        'Unfairness',
+        'Unfair',
+        'Ethical algorithm design',
+        'Bias mitigation',
+        'Representational fairness',
+        'Group fairness',
+        'Individual fairness',
+        'Fair data practices',
+        'Equity in AI',
+        'Equity in Artificial Intelligence',
+        'Justice',
+        'Non-discrimination',
+    ],
+    "Privacy & Data Governance": [
+        'Data privacy',
+        'Data governance',
+        'Differential privacy',
+        'Data protection',
+        'Data breach',
+        'Secure data storage',
+        'Data ethics',
+        'Data integrity',
+        'Data transparency',
+        'Privacy by design',
+        'Confidentiality',
+        'Inference privacy',
+        'Machine unlearning',
+        'Privacy-preserving',
+        'Data protection',
+        'Anonymity',
+        'Trustworthy data curation',
+    ],
+    "Security": [
+        'Red teaming',
+        'Adversarial attack',
+        'Cybersecurity',
+        'Threat detection',
+        'Vulnerability assessment',
+        'Ethical hacking',
+        'Fraud detection',
+        'Security ethics',
+        'AI incident',
+        'Artificial Intelligence incident',
+        'Security',
+        'Safety',
+        'Audits',
+        'Attacks',
+        'Forensic analysis',
+        'Adversarial learning',
+    ],
+}
+
+
+def get_category(texts, keywords=()):
+    """
+    Returns the first category with a keyword contained in any of texts or
+    equal to one of the paper's own keywords (case-insensitive), else None.
+    """
+    texts = [text.lower() for text in texts]
+    keywords = [keyword.lower() for keyword in keywords]
+    for category, category_keywords in KEYWORDS.items():
+        for keyword in category_keywords:
+            keyword = keyword.lower()
+            if keyword in keywords or any(keyword in text for text in texts):
+                return category
+    return None
@@ -0,0 +1,173 @@
+import asyncio
+import concurrent.futures
+import functools
+import os
+import time
+import aimd
+import http_client
+import retry
+import telemetry
+
+
+class HostLimit:
+    """
+    Politeness budget for one host: a token bucket refilled at `rate`
+    requests per second that holds at most `burst` tokens, plus a cap on
+    the number of requests in flight at once. Below the cap an AIMD window
+    (see aimd) decides how many requests are actually in flight.
+    """
+
+    def __init__(self, rate, burst=1, concurrency=1):
+        self.rate = rate
+        self.burst = burst
+        self.concurrency = concurrency
+
+
+HOST_LIMITS = {
+    "openreview.net": HostLimit(rate=2, burst=4, concurrency=8),
+    "api2.openreview.net": HostLimit(rate=1, burst=2, concurrency=4),
+    "dl.acm.org": HostLimit(rate=0.1, burst=1, concurrency=2),
+    "ojs.aaai.org": HostLimit(rate=10, burst=10, concurrency=aimd.MAX_WINDOW),
+    "nips.cc": HostLimit(rate=10, burst=10, concurrency=10),
+}
+DEFAULT_LIMIT = HostLimit(rate=1, burst=1, concurrency=2)
+
+# extra or replacement limits, e.g. "127.0.0.1=100/50/16,openreview.net=1/2/4"
+# (rate/burst/concurrency per host), for test servers or one-off tuning
+HOST_LIMITS_ENV = "CRAWL_HOST_LIMITS"
+
+
+class TokenBucket:
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    async def acquire(self):
+        """
+        Waits until a token is available and takes it.
+        """
+        async with self.lock:
+            while True:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+def limits_from_env(value=None):
+    """
+    Parses HOST_LIMITS_ENV into {host: HostLimit}.
+    """
+    value = os.environ.get(HOST_LIMITS_ENV, "") if value is None else value
+    limits = {}
+    for entry in filter(None, (part.strip() for part in value.split(","))):
+        host, spec = entry.split("=")
+        rate, burst, concurrency = spec.split("/")
+        limits[host] = HostLimit(float(rate), int(burst), int(concurrency))
+    return limits
+
+
+class Crawler:
+    """
+    Runs blocking http_client requests from asyncio, paced per host by a token
+    bucket and a concurrency cap, so that many requests are in flight up to
+    each host's politeness budget.
+    """
+
+    def __init__(self, limits=None):
+        self.limits = dict(HOST_LIMITS)
+        self.limits.update(limits_from_env())
+        if limits:
+            self.limits.update(limits)
+        self.buckets = {}
+        self.windows = {}
+        caps = [limit.concurrency for limit in self.limits.values()] + [DEFAULT_LIMIT.concurrency]
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=sum(caps))
+        http_client.configure(max_workers=max(caps))
+
+    def limit_for(self, host):
+        return self.limits.get(host, DEFAULT_LIMIT)
+
+    def _limiter(self, host):
+        if host not in self.buckets:
+            limit = self.limit_for(host)
+            self.buckets[host] = TokenBucket(limit.rate, limit.burst)
+            self.windows[host] = aimd.AsyncAimdController(
+                host, initial=min(aimd.INITIAL_WINDOW, limit.concurrency), maximum=limit.concurrency
+            )
+        return self.buckets[host], self.windows[host]
+
+    async def get(self, url, **kwargs):
+        """
+        GET through the shared pooled client once the host's budget allows it,
+        retried with backoff on timeouts and RETRY_STATUSES behind the host's
+        circuit breaker (see retry). Fresh cached pages don't cost any budget.
+        """
+        response = http_client.get_fresh(url, **kwargs)
+        if response is not None:
+            return response
+        for number in range(retry.MAX_ATTEMPTS):
+            with retry.Attempt(url, number) as attempt:
+                attempt.response = await self._fetch(attempt.host, url, **kwargs)
+            if attempt.delay is None:
+                break
+            await asyncio.sleep(attempt.delay)
+        return attempt.result()
+
+    async def _fetch(self, host, url, **kwargs):
+        bucket, window = self._limiter(host)
+        waiting = time.perf_counter()
+        await window.acquire()
+        try:
+            await bucket.acquire()
+            # time spent held back by the politeness budget
+            start = time.perf_counter()
+            telemetry.observe("crawl_wait_seconds", start - waiting, host=host)
+            if http_client.uses_http2(url):
+                response = await http_client.get_http2(url, executor=self.executor, **kwargs)
+            else:
+                loop = asyncio.get_running_loop()
+                response = await loop.run_in_executor(self.executor, functools.partial(http_client.get, url, **kwargs))
+        except retry.RETRY_ERRORS:
+            window.release(throttled=True)
+            raise
+        except BaseException:
+            window.release()
+            raise
+        window.release(time.perf_counter() - start, response.status_code in aimd.THROTTLE_STATUSES)
+        return response
+
+    async def map(self, fn, items, window=64):
+        """
+        Runs the coroutine function fn on every item, with at most `window`
+        items in progress, and yields (item, result, error) as each finishes.
+        """
+        items = iter(items)
+        pending = {}
+
+        def fill():
+            while len(pending) < window:
+                item = next(items, StopIteration)
+                if item is StopIteration:
+                    return
+                pending[asyncio.ensure_future(fn(item))] = item
+
+        fill()
+        while pending:
+            done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                item = pending.pop(task)
+                if task.exception() is not None:
+                    yield item, None, task.exception()
+                else:
+                    yield item, task.result(), None
+            fill()
+
+    def close(self):
+        self.executor.shutdown(wait=False)
@@ -0,0 +1,92 @@
+import argparse
+import asyncio
+import shlex
+import time
+import aaai
+import aies
+import crawl
+import engine
+import facct
+import http_client
+import iclr
+import icml
+import neurips
+import refresh
+import telemetry
+
+VENUES = {
+    "aaai": aaai.AaaiVenue,
+    "aies": aies.AiesVenue,
+    "facct": facct.FacctVenue,
+    "iclr": iclr.IclrVenue,
+    "icml": icml.IcmlVenue,
+    "neurips": neurips.NeuripsVenue,
+}
+
+
+async def crawl_timed(venue, args, crawler):
+    start = time.perf_counter()
+    await engine.crawl_venue(venue, args, crawler)
+    print(f"{venue.name} done in {time.perf_counter() - start:.0f}s")
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Crawl several venues in one process. All venues share one crawler, so every "
+                    "host's politeness budget is spent on whichever venue has work for it, and the "
+                    "run takes about as long as the slowest host instead of the sum of all venues. "
+                    "Options not listed here are passed on to every venue."
+    )
+    parser.add_argument("--venues", nargs="+", choices=sorted(VENUES), default=sorted(VENUES))
+    for name in VENUES:
+        parser.add_argument(f"--{name}-args", default="", metavar="ARGS",
+                            help=f"options for {name} only, as one string; write --{name}-args=\"--help\" "
+                                 "when it starts with a dash")
+    telemetry.add_metrics_argument(parser)
+    args, common = parser.parse_known_args()
+
+    venues = []
+    for name in args.venues:
+        venue = VENUES[name]()
+        venue_args = engine.make_parser(venue).parse_args(common + shlex.split(getattr(args, f"{name}_args")))
+        if venue_args.reextract:
+            parser.error("--reextract needs no network crawl, run it per venue instead")
+        venues.append((venue, venue_args))
+
+    # the response cache and the HTTP/2 client are shared by all venues
+    if any(venue_args.refresh for _, venue_args in venues):
+        refresh.configure()
+    http2_hosts = set()
+    for venue, venue_args in venues:
+        if venue_args.http2 is not None:
+            http2_hosts.update(venue_args.http2 or venue.http2_hosts)
+    if http2_hosts:
+        http_client.configure_http2(http2_hosts)
+    if args.metrics_port:
+        telemetry.serve(args.metrics_port)
+
+    # one crawler holds the per-host token buckets and concurrency limits,
+    # so venues on the same host share its budget and different hosts overlap
+    crawler = crawl.Crawler()
+    start = time.perf_counter()
+    with engine.parse_pool():
+        results = await asyncio.gather(
+            *(crawl_timed(venue, venue_args, crawler) for venue, venue_args in venues),
+            return_exceptions=True,
+        )
+    crawler.close()
+    # one venue failing does not stop the others, but the run still fails
+    failed = []
+    for (venue, _), result in zip(venues, results):
+        if isinstance(result, BaseException):
+            failed.append(venue.name)
+            print(f"{venue.name} failed: {result!r}")
+    print(f"All venues done in {time.perf_counter() - start:.0f}s")
+    print(http_client.get_cache().summary())
+    telemetry.dump("all")
+    if failed:
+        raise SystemExit(f"failed: {', '.join(failed)}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,250 @@
+import argparse
+import asyncio
+import concurrent.futures
+import contextlib
+import os
+import time
+import crawl
+import frontier
+import http_client
+import reextract
+import refresh
+import retry
+import shard
+import sink
+import telemetry
+
+
+class PageMissing(Exception):
+    """
+    Raised by Venue.extract when a paper has no page (yet). The paper is
+    marked failed and tried again on the next run, without retries in this one.
+    """
+
+
+class Venue:
+    """
+    One venue as seen by the engine: which papers exist (discover) and the
+    fields of one paper (extract). Fetching, politeness, caching, retries,
+    the frontier, the output CSV, refresh, re-extraction and telemetry are
+    all the engine's (see run), so every venue gets them the same way.
+    """
+
+    # names the frontier, metrics and output files, e.g. "iclr"
+    name = None
+    # hosts worth multiplexing over HTTP/2 with --http2, e.g. those serving
+    # many small pages per paper
+    http2_hosts = ()
+
+    @property
+    def csv_file(self):
+        return f"data/{self.name}_papers.csv"
+
+    def add_arguments(self, parser):
+        """
+        Adds the venue's own command line options.
+        """
+
+    def configure(self, args):
+        """
+        Called with the parsed command line before anything is fetched.
+        """
+
+    async def discover(self, crawler):
+        """
+        Returns {link: data} for every paper to crawl, in crawl order. data is
+        whatever discovery already knows about the paper (e.g. its fields from
+        a bulk API), handed back to extract; None if nothing.
+        """
+        raise NotImplementedError
+
+    async def extract(self, crawler, link, data=None):
+        """
+        Returns the paper as a dict with the sink.HEADER keys, or None if it
+        does not fall under any category. Errors are raised so the paper is
+        retried instead of being saved with empty fields.
+        """
+        raise NotImplementedError
+
+    def report(self):
+        """
+        Prints the venue's own statistics at the end of a run.
+        """
+
+
+_parse_pool = None
+
+
+def _timed(fn, args):
+    # runs in the worker process; the parse time is recorded by the parent
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, result
+
+
+async def parse(fn, *args, kind="page"):
+    """
+    Runs the parser fn(*args) on the engine's process pool, so parse-heavy
+    venues use every core while the event loop keeps fetching. fn must be a
+    module-level function. Without a pool (e.g. inside a re-extraction
+    worker) it runs inline. Either way its time is recorded under kind.
+    """
+    if _parse_pool is None:
+        with telemetry.timer("crawl_parse_seconds", kind=kind):
+            return fn(*args)
+    elapsed, result = await asyncio.get_running_loop().run_in_executor(_parse_pool, _timed, fn, args)
+    telemetry.observe("crawl_parse_seconds", elapsed, kind=kind)
+    return result
+
+
+async def _extract_job(crawler, venue, link, data):
+    return await venue.extract(crawler, link, data)
+
+
+def run_reextract(venue, found, links, csv_file):
+    """
+    Re-runs the venue's extractor over archived pages on every core, without
+    network access, into a separate output.
+    """
+    output_file = reextract.output_path(csv_file)
+    jobs = [(venue, link, found.get(link)) for link in links]
+    failed = 0
+    with sink.CsvSink(output_file, mode="w") as output:
+        for (_, link, _), paper, error in reextract.run(jobs, _extract_job):
+            if error:
+                failed += 1
+                print(f"Error processing {link}: {error}")
+            elif paper:
+                output.write(paper)
+    print(f"Re-extracted {len(jobs)} papers ({output.written} kept, {failed} failed) into {output_file}")
+
+
+async def crawl_pending(venue, crawler, journal, csv_file, found):
+    """
+    Crawls every link the journal still has pending or failed and appends the
+    papers that qualify to csv_file.
+    """
+    async def visit(item):
+        i, link = item
+        journal.start(link)
+        return await venue.extract(crawler, link, found.get(link))
+
+    # papers count as fetched in the journal once their row is on disk
+    def saved(papers):
+        journal.finish_all([paper["link"] for paper in papers], frontier.FETCHED)
+
+    # papers that still fail after their retries get another pass at the end
+    dead_letters = retry.DeadLetters()
+    todo = journal.pending()
+    with sink.CsvSink(csv_file, on_flush=saved) as output:
+        while todo:
+            async for (i, link), paper, error in crawler.map(visit, todo):
+                if isinstance(error, PageMissing):
+                    journal.finish(link, frontier.FAILED, error)
+                    telemetry.count("crawl_papers_total", venue=venue.name, outcome="failed")
+                    print(f"No page for {link} ({error}), paper # {i}")
+                elif error:
+                    journal.finish(link, frontier.FAILED, error)
+                    retried = dead_letters.add((i, link), retry.host_of(link))
+                    if not retried:
+                        telemetry.count("crawl_papers_total", venue=venue.name, outcome="failed")
+                    print(f"Error processing {link}: {error}" + (" (will retry)" if retried else ""))
+                elif paper:
+                    output.write(paper)
+                    telemetry.count("crawl_papers_total", venue=venue.name, outcome="accepted")
+                    print(f"Saved: {link}, paper # {i}")
+                else:
+                    journal.finish(link, frontier.REJECTED)
+                    telemetry.count("crawl_papers_total", venue=venue.name, outcome="rejected")
+                    print(f"Invalid paper: {link}, paper # {i}")
+            todo = await dead_letters.requeue_async()
+
+
+def make_parser(venue):
+    """
+    Command line of one venue: its own options plus the engine's.
+    """
+    parser = argparse.ArgumentParser(description=f"Scrape {venue.name.upper()} papers into {venue.csv_file}.")
+    venue.add_arguments(parser)
+    shard.add_shard_argument(parser)
+    telemetry.add_metrics_argument(parser)
+    reextract.add_reextract_argument(parser)
+    refresh.add_refresh_arguments(parser)
+    http_client.add_http2_argument(parser, venue.http2_hosts)
+    return parser
+
+
+@contextlib.contextmanager
+def parse_pool():
+    """
+    Starts the process pool used by parse for the duration of a crawl.
+    """
+    global _parse_pool
+    _parse_pool = concurrent.futures.ProcessPoolExecutor(max_workers=os.cpu_count() or 1)
+    try:
+        yield _parse_pool
+    finally:
+        _parse_pool.shutdown()
+        _parse_pool = None
+
+
+async def crawl_venue(venue, args, crawler):
+    """
+    Discovery, then the crawl of every link not done yet (after a refresh of
+    the ones that are, with --refresh), for one venue configured from args.
+    Requests go through crawler, which may be shared with other venues.
+    """
+    venue.configure(args)
+    name = shard.shard_name(venue.name, args.shard)
+    csv_file = shard.shard_name(venue.csv_file, args.shard)
+    found = await venue.discover(crawler)
+    links = shard.filter_links(list(found), args.shard)
+    print(f"Found {len(links)} {venue.name} papers")
+
+    journal = frontier.open_frontier(name)
+    journal.add(links)
+    if journal.is_new:
+        # carry over papers saved by runs from before the journal existed
+        journal.mark_all(sink.read_rows(csv_file), frontier.FETCHED)
+    print(f"{venue.name} frontier: {journal.summary()}")
+    if args.refresh:
+        # bring the papers crawled before up to date, then crawl any new links as usual
+        await refresh.refresh(crawler, journal, csv_file,
+                              lambda link: venue.extract(crawler, link, found.get(link)),
+                              venue.name, args.refresh_limit)
+    await crawl_pending(venue, crawler, journal, csv_file, found)
+    print(f"{venue.name} frontier: {journal.summary()}")
+    journal.close()
+    venue.report()
+
+
+async def run(venue, argv=None):
+    """
+    Runs one venue end to end from the command line (see crawl_venue), or
+    re-extracts its archived pages with --reextract.
+    """
+    args = make_parser(venue).parse_args(argv)
+    if args.refresh:
+        refresh.configure()
+    if args.http2 is not None:
+        http_client.configure_http2(args.http2 or venue.http2_hosts)
+    if args.metrics_port:
+        telemetry.serve(args.metrics_port)
+
+    if args.reextract:
+        venue.configure(args)
+        found = await venue.discover(reextract.ArchivedCrawler())
+        links = shard.filter_links(list(found), args.shard)
+        run_reextract(venue, found, links, shard.shard_name(venue.csv_file, args.shard))
+        return
+
+    crawler = crawl.Crawler()
+    with parse_pool():
+        await crawl_venue(venue, args, crawler)
+    crawler.close()
+    print(http_client.get_cache().summary())
+    telemetry.dump(shard.shard_name(venue.name, args.shard))
+
+
+def main(venue):
+    asyncio.run(run(venue))
@@ -0,0 +1,230 @@
+import re
+from html.parser import HTMLParser
+from urllib.parse import urljoin
+
+# elements that never have an end tag
+VOID_TAGS = {
+    "area", "base", "br", "col", "embed", "hr", "img", "input",
+    "link", "meta", "param", "source", "track", "wbr",
+}
+HEADER_TAGS = ("h2", "h3")
+
+
+def class_matches(value, cls):
+    # same rule as BeautifulSoup's class_: a single class must be one of the
+    # element's classes, a multi-word string must equal the whole attribute
+    if cls is None:
+        return True
+    if value is None:
+        return False
+    if " " in cls:
+        return " ".join(value.split()) == cls
+    return cls in value.split()
+
+
+class Capture:
+    """
+    Text fragments of one matched element. Fragments inside the element's
+    first <h2>/<h3> are flagged so callers can drop a section header.
+    """
+
+    def __init__(self, tag):
+        self.tag = tag
+        self.depth = 1
+        self.fragments = []
+        self.header_tag = None
+        self.header_depth = 0
+        self.headers_seen = 0
+
+    def text(self, separator="", strip=False, drop_header=False):
+        parts = [text for text, in_header in self.fragments if not (drop_header and in_header)]
+        if strip:
+            parts = [part.strip() for part in parts if part.strip()]
+        return separator.join(parts)
+
+
+class MetaExtractor(HTMLParser):
+    """
+    Single-pass streaming extractor that keeps only what the scrapers read:
+      - metas: contents of <meta> tags by name or property
+      - elements: (key, tag, class, parent key) specs whose text is captured;
+        with a parent key, only matches inside the first parent are kept
+      - links: (key, substring) specs collecting <a href> values containing it
+    No document tree is built.
+    """
+
+    def __init__(self, metas=(), elements=(), links=()):
+        super().__init__(convert_charrefs=True)
+        self.meta = {name: [] for name in metas}
+        self.element_specs = list(elements)
+        self.captures = {spec[0]: [] for spec in self.element_specs}
+        self.link_specs = list(links)
+        self.links = {key: [] for key, _ in self.link_specs}
+        self.open = {}
+        self.skip = 0
+
+    def handle_starttag(self, tag, attrs):
+        attrs = dict(attrs)
+        if tag == "meta":
+            for attr in ("name", "property"):
+                name = attrs.get(attr)
+                if name in self.meta:
+                    self.meta[name].append(attrs.get("content") or "")
+            return
+        if tag in ("script", "style"):
+            self.skip += 1
+        if tag == "a" and self.link_specs:
+            href = attrs.get("href")
+            if href:
+                for key, substring in self.link_specs:
+                    if substring in href:
+                        self.links[key].append(href)
+        if tag in VOID_TAGS:
+            return
+
+        for capture in self.open.values():
+            if tag == capture.tag:
+                capture.depth += 1
+            if capture.header_depth:
+                if tag == capture.header_tag:
+                    capture.header_depth += 1
+            elif tag in HEADER_TAGS and not capture.headers_seen:
+                capture.header_tag = tag
+                capture.header_depth = 1
+                capture.headers_seen = 1
+
+        for key, spec_tag, cls, parent in self.element_specs:
+            if tag != spec_tag or key in self.open or not class_matches(attrs.get("class"), cls):
+                continue
+            if parent is not None and (parent not in self.open or len(self.captures[parent]) != 1):
+                continue
+            capture = Capture(tag)
+            self.captures[key].append(capture)
+            self.open[key] = capture
+
+    def handle_endtag(self, tag):
+        if tag in ("script", "style") and self.skip:
+            self.skip -= 1
+        for key, capture in list(self.open.items()):
+            if capture.header_depth and tag == capture.header_tag:
+                capture.header_depth -= 1
+            if tag == capture.tag:
+                capture.depth -= 1
+                if capture.depth == 0:
+                    del self.open[key]
+
+    def handle_data(self, data):
+        if self.skip:
+            return
+        for capture in self.open.values():
+            capture.fragments.append((data, capture.header_depth > 0))
+
+    def first(self, key):
+        captures = self.captures[key]
+        return captures[0] if captures else None
+
+
+def extract(html, metas=(), elements=(), links=()):
+    extractor = MetaExtractor(metas, elements, links)
+    extractor.feed(html)
+    extractor.close()
+    return extractor
+
+
+def parse_ojs_paper(html, url):
+    """
+    Fast path for an OJS (AAAI/AIES) article page. Returns the same
+    dictionary as parse_paper_attributes in main/ojs.py.
+    """
+    page = extract(
+        html,
+        metas=[
+            "citation_section", "citation_title", "citation_author",
+            "citation_author_institution", "citation_author_country",
+        ],
+        elements=[
+            ("h1", "h1", None, None),
+            ("abstract", "section", "item abstract", None),
+            ("keywords", "section", "item keywords", None),
+            ("keywords_value", "span", "value", "keywords"),
+            ("ccs", "section", "item ccs", None),
+            ("ccs_value", "span", "value", "ccs"),
+        ],
+    )
+    meta = page.meta
+
+    attributes = {}
+    attributes["link"] = url
+    attributes["category"] = meta["citation_section"][0] if meta["citation_section"] else ""
+
+    if meta["citation_title"]:
+        attributes["title"] = meta["citation_title"][0]
+    else:
+        h1 = page.first("h1")
+        attributes["title"] = h1.text(strip=True) if h1 else ""
+
+    abstract = page.first("abstract")
+    attributes["abstract"] = abstract.text(" ", strip=True, drop_header=True).replace("\n", " ") if abstract else ""
+
+    keywords = []
+    keywords_value = page.first("keywords_value")
+    if page.first("keywords") and keywords_value:
+        raw_text = keywords_value.text(" ", strip=True)
+        keywords = [kw.strip() for kw in raw_text.split(",") if kw.strip()]
+    attributes["keywords"] = keywords
+
+    ccs = page.first("ccs")
+    if ccs:
+        ccs_value = page.first("ccs_value")
+        attributes["ccs_concepts"] = (ccs_value or ccs).text(" ", strip=True)
+    else:
+        attributes["ccs_concepts"] = ""
+
+    attributes["author_names"] = [content.strip() for content in meta["citation_author"]]
+    attributes["author_affiliations"] = [content.strip() for content in meta["citation_author_institution"]]
+    attributes["author_countries"] = [content.strip() for content in meta["citation_author_country"]]
+    return attributes
+
+
+def parse_openreview_forum(html, base_url):
+    """
+    Fast path for an OpenReview forum page. Returns the same dictionary as
+    openreview.parse_forum_soup.
+    """
+    page = extract(
+        html,
+        metas=["description", "og:description", "citation_author"],
+        elements=[
+            ("title", "h2", "citation_title", None),
+            ("keywords", "span", "note-content-value", None),
+        ],
+        links=[("profiles", "/profile?id")],
+    )
+    meta = page.meta
+    forum = {}
+
+    title = page.first("title")
+    forum["title"] = title.text().strip() if title else ""
+
+    descriptions = meta["description"] or meta["og:description"]
+    forum["abstract"] = descriptions[0].strip() if descriptions else ""
+
+    forum["authors"] = [content.strip() for content in meta["citation_author"]]
+
+    keywords = page.first("keywords")
+    forum["keywords"] = [kw.strip() for kw in keywords.text().strip().split(",")] if keywords else []
+
+    forum["profile_links"] = [urljoin(base_url, href) for href in page.links["profiles"]]
+    return forum
+
+
+def parse_openreview_institution(html):
+    """
+    Fast path for an OpenReview profile page, same result as
+    openreview.parse_institution_soup.
+    """
+    page = extract(html, elements=[("institution", "div", "institution", None)])
+    institution = page.first("institution")
+    if not institution:
+        return ""
+    return re.sub(r"\s*\(\S*?\.\S*?\)$", "", institution.text().strip()).strip()
@@ -0,0 +1,143 @@
+import os
+import sqlite3
+import time
+
+PENDING = "pending"
+FETCHED = "fetched"
+REJECTED = "rejected"
+FAILED = "failed"
+
+FRONTIER_DIR = "frontier"
+
+
+class Frontier:
+    """
+    Durable crawl journal with one row per link: its position in the link
+    list, its status (pending, fetched, rejected or failed), the number of
+    attempts and the timing of the last one. Links that were fetched or
+    rejected are never handed out again, so a restart resumes where the
+    last run stopped.
+
+    For refresh runs each link also keeps a fingerprint of its extracted
+    row and when it was last checked, and every change a refresh finds is
+    recorded in the changes table.
+    """
+
+    def __init__(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.is_new = not os.path.exists(path)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS links ("
+            "link TEXT PRIMARY KEY, position INTEGER NOT NULL, status TEXT NOT NULL, "
+            "attempts INTEGER NOT NULL DEFAULT 0, started_at REAL, finished_at REAL, error TEXT)"
+        )
+        self.conn.execute("CREATE INDEX IF NOT EXISTS links_status ON links (status, position)")
+        # journals from before refresh existed lack the fingerprint columns
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(links)")]
+        if "fingerprint" not in columns:
+            self.conn.execute("ALTER TABLE links ADD COLUMN fingerprint TEXT")
+            self.conn.execute("ALTER TABLE links ADD COLUMN checked_at REAL")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS changes ("
+            "link TEXT NOT NULL, field TEXT NOT NULL, old TEXT, new TEXT, changed_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def add(self, links):
+        """
+        Adds links that are not in the journal yet as pending, keeping their order.
+        """
+        start = self.conn.execute("SELECT COALESCE(MAX(position) + 1, 0) FROM links").fetchone()[0]
+        self.conn.executemany(
+            "INSERT OR IGNORE INTO links (link, position, status) VALUES (?, ?, ?)",
+            [(link, start + i, PENDING) for i, link in enumerate(links)],
+        )
+        self.conn.commit()
+
+    def mark_all(self, links, status):
+        self.conn.executemany("UPDATE links SET status = ? WHERE link = ?", [(status, link) for link in links])
+        self.conn.commit()
+
+    def pending(self):
+        """
+        Returns (position, link) for every link still to crawl, failed ones included.
+        """
+        return self.conn.execute(
+            "SELECT position, link FROM links WHERE status IN (?, ?) ORDER BY position",
+            (PENDING, FAILED),
+        ).fetchall()
+
+    def start(self, link):
+        self.conn.execute(
+            "UPDATE links SET attempts = attempts + 1, started_at = ? WHERE link = ?",
+            (time.time(), link),
+        )
+        self.conn.commit()
+
+    def finish(self, link, status, error=None):
+        self.conn.execute(
+            "UPDATE links SET status = ?, finished_at = ?, error = ? WHERE link = ?",
+            (status, time.time(), str(error) if error else None, link),
+        )
+        self.conn.commit()
+
+    def finish_all(self, links, status):
+        now = time.time()
+        self.conn.executemany(
+            "UPDATE links SET status = ?, finished_at = ?, error = NULL WHERE link = ?",
+            [(status, now, link) for link in links],
+        )
+        self.conn.commit()
+
+    def stalest(self, limit=None):
+        """
+        Returns every fetched or rejected link, least recently checked first;
+        links never refreshed count as checked when they were crawled.
+        """
+        return [link for (link,) in self.conn.execute(
+            "SELECT link FROM links WHERE status IN (?, ?) "
+            "ORDER BY COALESCE(checked_at, finished_at, 0), position LIMIT ?",
+            (FETCHED, REJECTED, -1 if limit is None else limit),
+        )]
+
+    def fingerprint(self, link):
+        row = self.conn.execute("SELECT fingerprint FROM links WHERE link = ?", (link,)).fetchone()
+        return row[0] if row else None
+
+    def checked(self, link, status, fingerprint, changes=()):
+        """
+        Records a refresh of link: its status and fingerprint now, and the
+        (field, old, new) changes found since the last one.
+        """
+        now = time.time()
+        self.conn.execute(
+            "UPDATE links SET status = ?, fingerprint = ?, checked_at = ?, error = NULL WHERE link = ?",
+            (status, fingerprint, now, link),
+        )
+        self.conn.executemany(
+            "INSERT INTO changes (link, field, old, new, changed_at) VALUES (?, ?, ?, ?, ?)",
+            [(link, field, old, new, now) for field, old, new in changes],
+        )
+        self.conn.commit()
+
+    def counts(self):
+        counts = {PENDING: 0, FETCHED: 0, REJECTED: 0, FAILED: 0}
+        for status, count in self.conn.execute("SELECT status, COUNT(*) FROM links GROUP BY status"):
+            counts[status] = count
+        return counts
+
+    def summary(self):
+        counts = self.counts()
+        return ", ".join(f"{count} {status}" for status, count in counts.items())
+
+    def close(self):
+        self.conn.close()
+
+
+def open_frontier(name):
+    """
+    Opens the journal for one scraper, e.g. open_frontier("iclr").
+    """
+    return Frontier(os.path.join(FRONTIER_DIR, f"{name}.sqlite"))
@@ -0,0 +1,285 @@
+import asyncio
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+import archive
+import response_cache
+import telemetry
+
+USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
+    "AppleWebKit/537.36 (KHTML, like Gecko) "
+    "Chrome/117.0.0.0 Safari/537.36"
+)
+DEFAULT_HEADERS = {"User-Agent": USER_AGENT}
+
+# (connect, read) timeout in seconds
+DEFAULT_TIMEOUT = (10, 60)
+
+# number of hosts we keep pools for, and connections kept alive per host
+MAX_HOSTS = 10
+MAX_WORKERS = 10
+
+# optional HTTP/2 transport (pip install "httpx[http2]")
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+_session = None
+_http2_client = None
+# hosts sent over HTTP/2, and those of them that answered over HTTP/1.1
+# instead and went back to the session's pool
+_http2_hosts = set()
+_http2_fallback = set()
+_cache = None
+_archive = None
+_lock = threading.Lock()
+
+
+def make_session(max_workers=MAX_WORKERS):
+    """
+    Builds a requests session with keep-alive connection pools sized to the
+    number of workers that will share it.
+    """
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    adapter = HTTPAdapter(
+        pool_connections=MAX_HOSTS,
+        pool_maxsize=max_workers,
+        pool_block=True,
+    )
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+
+def configure(max_workers=MAX_WORKERS):
+    """
+    Replaces the shared session with one sized for max_workers concurrent
+    requests per host. Call this before starting a worker pool.
+    """
+    global _session
+    with _lock:
+        if _session is not None:
+            _session.close()
+        _session = make_session(max_workers)
+    return _session
+
+
+def get_session():
+    """
+    Returns the shared session, creating it on first use.
+    """
+    global _session
+    if _session is None:
+        with _lock:
+            if _session is None:
+                _session = make_session()
+    return _session
+
+
+def configure_cache(path=response_cache.RESPONSE_CACHE_DIR, max_age=response_cache.CACHE_MAX_AGE):
+    """
+    Replaces the shared response cache, e.g. to change how long cached pages
+    are reused without revalidation (max_age=0 always revalidates).
+    """
+    global _cache
+    with _lock:
+        _cache = response_cache.ResponseCache(path, max_age)
+    return _cache
+
+
+def get_cache():
+    """
+    Returns the shared response cache, opening it on first use.
+    """
+    global _cache
+    if _cache is None:
+        with _lock:
+            if _cache is None:
+                _cache = response_cache.ResponseCache()
+    return _cache
+
+
+def configure_http2(hosts):
+    """
+    Sends the crawler's requests to the given hosts through an async HTTP/2
+    client, which multiplexes all concurrent requests to a host over one
+    connection (see crawl.Crawler and get_http2). A host that does not
+    negotiate h2 goes back to the HTTP/1.1 pool after its first response.
+    Without httpx[http2] installed every host stays on HTTP/1.1. Returns
+    the hosts now on HTTP/2.
+    """
+    global _http2_client, _http2_hosts
+    client = None
+    if hosts:
+        try:
+            if httpx is None:
+                raise ImportError("httpx")
+            # raises ImportError too when the h2 extra is missing
+            client = httpx.AsyncClient(http2=True, headers=DEFAULT_HEADERS, follow_redirects=True)
+        except ImportError:
+            print("[http2] httpx[http2] is not installed, staying on HTTP/1.1")
+    with _lock:
+        _http2_client = client
+        _http2_hosts = set(hosts) if client is not None else set()
+        _http2_fallback.clear()
+    return set(_http2_hosts)
+
+
+def uses_http2(url):
+    host = urlparse(url).hostname
+    return host in _http2_hosts and host not in _http2_fallback
+
+
+async def _http2_get(url, headers, params=None, timeout=DEFAULT_TIMEOUT):
+    """
+    GET over the HTTP/2 client, returned as a requests.Response and with
+    httpx errors raised as their requests counterparts, so callers and the
+    retry logic can't tell the transports apart.
+    """
+    connect, read = timeout if isinstance(timeout, tuple) else (timeout, timeout)
+    try:
+        response = await _http2_client.get(url, params=params, headers=headers,
+                                           timeout=httpx.Timeout(read, connect=connect))
+    except httpx.TimeoutException as e:
+        raise requests.Timeout(str(e))
+    except httpx.TransportError as e:
+        raise requests.ConnectionError(str(e))
+    except httpx.HTTPError as e:
+        raise requests.RequestException(str(e))
+    host = urlparse(url).hostname
+    if response.http_version != "HTTP/2" and host not in _http2_fallback:
+        _http2_fallback.add(host)
+        print(f"[http2] {host}: server answered over {response.http_version}, using the HTTP/1.1 pool")
+    converted = requests.Response()
+    converted.status_code = response.status_code
+    converted._content = response.content
+    converted.headers = CaseInsensitiveDict(response.headers)
+    converted.url = str(response.url)
+    converted.reason = response.reason_phrase
+    converted.encoding = requests.utils.get_encoding_from_headers(converted.headers)
+    return converted
+
+
+def add_http2_argument(parser, default_hosts=()):
+    parser.add_argument("--http2", nargs="*", metavar="HOST",
+                        help="send requests to these hosts (default: "
+                             + (", ".join(default_hosts) or "none")
+                             + ") over multiplexed HTTP/2 connections; needs httpx[http2], "
+                               "hosts without h2 fall back to HTTP/1.1")
+
+
+def configure_archive(path=archive.ARCHIVE_DIR):
+    """
+    Replaces the shared page archive, e.g. to archive into another directory.
+    """
+    global _archive
+    with _lock:
+        _archive = archive.PageArchive(path)
+    return _archive
+
+
+def get_archive():
+    """
+    Returns the shared page archive, opening it on first use.
+    """
+    global _archive
+    if _archive is None:
+        with _lock:
+            if _archive is None:
+                _archive = archive.PageArchive()
+    return _archive
+
+
+def cache_key(url, params=None):
+    return requests.Request("GET", url, params=params).prepare().url
+
+
+def get_fresh(url, params=None, **kwargs):
+    """
+    Returns the cached response for url if it is still fresh, otherwise None.
+    """
+    cache = get_cache()
+    entry = cache.lookup(cache_key(url, params))
+    if not cache.is_fresh(entry):
+        return None
+    cache.count("hits")
+    return cache.build_response(entry)
+
+
+def _lookup(url, kwargs):
+    """
+    Cache side of a GET, before the request: returns (key, cache entry,
+    fresh cached response or None, request headers), taking the caller's
+    headers out of kwargs.
+    """
+    cache = get_cache()
+    key = cache_key(url, kwargs.get("params"))
+    entry = cache.lookup(key)
+    if cache.is_fresh(entry):
+        cache.count("hits")
+        return key, entry, cache.build_response(entry), None
+    headers = dict(kwargs.pop("headers", None) or {})
+    headers.update(cache.conditional_headers(entry))
+    return key, entry, None, headers
+
+
+def _record(url, key, entry, response, elapsed):
+    """
+    Cache side of a GET, after the request: telemetry, reuse of the cached
+    page on a 304, and storing and archiving a new one.
+    """
+    cache = get_cache()
+    host = telemetry.host_label(url)
+    telemetry.observe("crawl_request_seconds", elapsed, host=host)
+    telemetry.count("crawl_requests_total", host=host, status=response.status_code)
+    telemetry.count("crawl_response_bytes_total", len(response.content), host=host)
+    if response.status_code == 304 and entry is not None:
+        cache.count("revalidated")
+        cache.touch(key)
+        return cache.build_response(entry)
+
+    cache.count("misses")
+    if response.status_code == 200:
+        cache.store(key, response)
+    if response.status_code in (200, 404):
+        # a 404 is archived too (status only), so re-extraction sees the page missing
+        get_archive().append(key, response)
+    return response
+
+
+def get(url, **kwargs):
+    """
+    GET through the shared session with the default timeout applied.
+    Fresh cached pages are returned without a request; older ones are
+    revalidated with If-None-Match/If-Modified-Since and reused on a 304.
+    Every page downloaded is also kept in the page archive.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    key, entry, cached, headers = _lookup(url, kwargs)
+    if cached is not None:
+        return cached
+    start = time.perf_counter()
+    response = get_session().get(url, headers=headers, **kwargs)
+    return _record(url, key, entry, response, time.perf_counter() - start)
+
+
+async def get_http2(url, executor=None, **kwargs):
+    """
+    get over the HTTP/2 client, for hosts where uses_http2 is true. Runs on
+    the caller's event loop; the cache and archive work runs on executor so
+    it does not hold up the other requests in flight.
+    """
+    kwargs.setdefault("timeout", DEFAULT_TIMEOUT)
+    loop = asyncio.get_running_loop()
+    key, entry, cached, headers = await loop.run_in_executor(executor, _lookup, url, kwargs)
+    if cached is not None:
+        return cached
+    start = time.perf_counter()
+    response = await _http2_get(url, headers, **kwargs)
+    return await loop.run_in_executor(executor, _record, url, key, entry, response, time.perf_counter() - start)
@@ -0,0 +1,198 @@
+from bs4 import BeautifulSoup
+from urllib.parse import urljoin
+import categories
+import engine
+import fastparse
+import retry
+
+
+async def get_paper_links(crawler, url):
+    """
+    Given an issue URL, scrapes and returns a list of paper links. Raises
+    requests.RequestException if the page still fails after retries.
+    """
+    response = await crawler.get(url)
+    response.raise_for_status()
+
+    soup = BeautifulSoup(response.text, "html.parser")
+
+    # On OJS issue pages, paper links are found in
+    # <h3> tags with class "title" -> nested <a> tag -> href attribute
+    h3_tags = soup.find_all("h3", class_="title")
+    href_list = []
+
+    for h3 in h3_tags:
+        a_tag = h3.find("a")
+        if a_tag and a_tag.get("href"):
+            href_list.append(urljoin(url, a_tag["href"]))
+
+    return href_list
+
+
+async def get_issue_links(crawler, index_url, match=None):
+    """
+    Returns the issue pages listed on an OJS proceedings index (issue archive)
+    page, keeping only issues whose title contains match if given.
+    """
+    response = await crawler.get(index_url)
+    response.raise_for_status()
+    soup = BeautifulSoup(response.text, "html.parser")
+    issue_links = []
+    for a_tag in soup.find_all("a", href=True):
+        if "/issue/view/" not in a_tag["href"]:
+            continue
+        if match and match.lower() not in a_tag.get_text(" ", strip=True).lower():
+            continue
+        issue_links.append(urljoin(index_url, a_tag["href"]))
+    return list(dict.fromkeys(issue_links))
+
+
+async def get_all_paper_links(crawler, issue_urls):
+    """
+    Fetches every issue listing concurrently and returns the paper links of
+    all issues with duplicates removed, in issue order. Issues that still
+    fail after their retries get another pass before giving up on them.
+    """
+    links_by_issue = {}
+    dead_letters = retry.DeadLetters()
+    todo = list(dict.fromkeys(issue_urls))
+    while todo:
+        async for issue, links, error in crawler.map(lambda issue: get_paper_links(crawler, issue), todo):
+            if error:
+                retried = dead_letters.add(issue, retry.host_of(issue))
+                print(f"error fetching issue {issue}: {error}" + (" (will retry)" if retried else ""))
+            else:
+                links_by_issue[issue] = links
+                print(f"found {len(links)} paper links in {issue}")
+        todo = await dead_letters.requeue_async()
+    ordered = [link for issue in issue_urls if issue in links_by_issue for link in links_by_issue[issue]]
+    return list(dict.fromkeys(ordered))
+
+
+def parse_paper(url, content, encoding):
+    """
+    Parses a downloaded article page with the fast streaming extractor.
+    Runs in the engine's parse process pool.
+    """
+    return fastparse.parse_ojs_paper(content.decode(encoding or "utf-8", errors="replace"), url)
+
+
+def parse_paper_attributes(html, url):
+    """
+    Reference BeautifulSoup parser for a paper page, kept to check the fast
+    path against (utils/bench_parse.py). Returns a dictionary of attributes:
+      - link
+      - category
+      - title
+      - abstract
+      - keywords (list)
+      - ccs_concepts
+      - author_names (list)
+      - author_affiliations (list)
+      - author_countries (list)
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    
+    attributes = {}
+    attributes["link"] = url
+
+    # placeholder
+    cat_meta = soup.find("meta", {"name": "citation_section"})
+    attributes["category"] = cat_meta.get("content", "") if cat_meta else ""
+
+    # extract title from meta tag
+    title_meta = soup.find("meta", {"name": "citation_title"})
+    if title_meta:
+        attributes["title"] = title_meta.get("content", "")
+    else:
+        title_tag = soup.find("h1")
+        attributes["title"] = title_tag.get_text(strip=True) if title_tag else ""
+
+    # extract abstract from <section> tag with class "item abstract"
+    abstract_section = soup.find("section", class_="item abstract")
+    if abstract_section:
+        # remove header element (if any) inside the abstract section
+        header = abstract_section.find(['h2', 'h3'])
+        if header:
+            header.extract()
+        attributes["abstract"] = abstract_section.get_text(" ", strip=True).replace("\n", " ")
+    else:
+        attributes["abstract"] = ""
+
+    # extract keywords from <section> tag with class "item keywords"
+    keywords_section = soup.find("section", class_="item keywords")
+    keywords = []
+    if keywords_section:
+        span_value = keywords_section.find("span", class_="value")
+        if span_value:
+            raw_text = span_value.get_text(" ", strip=True)
+            # split by commas and strip each keyword
+            keywords = [kw.strip() for kw in raw_text.split(",") if kw.strip()]
+    attributes["keywords"] = keywords
+
+    # extract ccs concepts from <section> tag with class "item ccs"
+    ccs_section = soup.find("section", class_="item ccs")
+    if ccs_section:
+        span_value = ccs_section.find("span", class_="value")
+        attributes["ccs_concepts"] = span_value.get_text(" ", strip=True) if span_value else ccs_section.get_text(" ", strip=True)
+    else:
+        attributes["ccs_concepts"] = ""
+
+    # extract author information from meta tags
+    author_names = [meta.get("content", "").strip() for meta in soup.find_all("meta", {"name": "citation_author"})]
+    author_affiliations = [meta.get("content", "").strip() for meta in soup.find_all("meta", {"name": "citation_author_institution"})]
+    author_countries = [meta.get("content", "").strip() for meta in soup.find_all("meta", {"name": "citation_author_country"})]
+    
+    attributes["author_names"] = author_names
+    attributes["author_affiliations"] = author_affiliations
+    attributes["author_countries"] = author_countries
+
+    return attributes
+
+
+class OjsVenue(engine.Venue):
+    """
+    A proceedings hosted on Open Journal Systems (AAAI, AIES). Papers are
+    listed on issue pages, given directly with --issue or found on a
+    proceedings index with --index; any number of issues is crawled as one
+    job into one output.
+    """
+
+    # issue pages crawled when no --issue or --index is given
+    issue_urls = []
+    # e.g. https://ojs.aaai.org/index.php/AAAI/issue/archive, for the help text
+    index_example = None
+
+    def add_arguments(self, parser):
+        parser.add_argument("--issue", action="append", default=[],
+                            help="OJS issue page to crawl (repeatable)")
+        parser.add_argument("--index", action="append", default=[],
+                            help=f"proceedings index page listing issue pages, e.g. {self.index_example} (repeatable)")
+        parser.add_argument("--match",
+                            help=f"only crawl issues from --index whose title contains this, e.g. \"{self.name.upper()}-24\"")
+
+    def configure(self, args):
+        self.issues = list(args.issue)
+        self.indexes = list(args.index)
+        self.match = args.match
+
+    async def discover(self, crawler):
+        issue_urls = list(self.issues)
+        for index_url in self.indexes:
+            issue_urls.extend(await get_issue_links(crawler, index_url, self.match))
+        issue_urls = issue_urls or self.issue_urls
+        print(f"collecting papers from {len(issue_urls)} issues...")
+        return dict.fromkeys(await get_all_paper_links(crawler, issue_urls))
+
+    async def extract(self, crawler, link, data=None):
+        response = await crawler.get(link)
+        response.raise_for_status()
+        paper = await engine.parse(parse_paper, link, response.content, response.encoding, kind="ojs")
+        category = categories.get_category(
+            [paper.get("title", ""), paper.get("abstract", ""), " ".join(paper.get("keywords", [])),
+             paper.get("ccs_concepts", "")]
+        )
+        if not category:
+            return None
+        paper["category"] = category
+        return paper
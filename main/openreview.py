@@ -0,0 +1,323 @@
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import time
+from urllib.parse import urljoin, urlparse, parse_qs
+from bs4 import BeautifulSoup
+import fastparse
+import telemetry
+
+BASE_URL = "https://openreview.net/"
+API_URL = "https://api2.openreview.net/"
+API_PAGE_SIZE = 1000
+
+# author institutions rarely change within a crawl season
+PROFILE_CACHE_FILE = "cache/openreview_profiles.sqlite"
+PROFILE_TTL = 120 * 24 * 60 * 60
+# a refresh run checks profiles again once they are this old
+PROFILE_REFRESH_AGE = 7 * 24 * 60 * 60
+
+
+def links_file(venue, year):
+    """
+    The forum links of one venue and year, as kept up to date by
+    utils/save_links.py, e.g. links/iclr2024_openreview_links.txt.
+    """
+    return f"links/{venue}{year}_openreview_links.txt"
+
+
+class ProfileCache:
+    """
+    On-disk cache of author institutions keyed by OpenReview profile id,
+    shared by the ICLR, ICML and NeurIPS scrapers. Each profile also keeps
+    a fingerprint of the page it was parsed from, and changes of
+    institution are recorded in the changes table.
+    """
+
+    def __init__(self, path=PROFILE_CACHE_FILE, ttl=PROFILE_TTL):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS profiles ("
+            "id TEXT PRIMARY KEY, institution TEXT NOT NULL, fetched_at REAL NOT NULL)"
+        )
+        # caches from before refresh existed lack the fingerprint column
+        columns = [row[1] for row in self.conn.execute("PRAGMA table_info(profiles)")]
+        if "fingerprint" not in columns:
+            self.conn.execute("ALTER TABLE profiles ADD COLUMN fingerprint TEXT")
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS changes ("
+            "id TEXT NOT NULL, old TEXT NOT NULL, new TEXT NOT NULL, changed_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def get(self, profile_id):
+        """
+        Returns the cached institution, or None if missing or older than the TTL.
+        """
+        row = self.conn.execute(
+            "SELECT institution, fetched_at FROM profiles WHERE id = ?", (profile_id,)
+        ).fetchone()
+        if row and time.time() - row[1] < self.ttl:
+            self.hits += 1
+            telemetry.count("crawl_cache_lookups_total", cache="profiles", result="hit")
+            return row[0]
+        self.misses += 1
+        telemetry.count("crawl_cache_lookups_total", cache="profiles", result="miss")
+        return None
+
+    def stored(self, profile_id):
+        """
+        Returns (institution, fingerprint) whatever their age, or None.
+        """
+        return self.conn.execute(
+            "SELECT institution, fingerprint FROM profiles WHERE id = ?", (profile_id,)
+        ).fetchone()
+
+    def put(self, profile_id, institution, fingerprint=None):
+        now = time.time()
+        previous = self.stored(profile_id)
+        if previous is not None and previous[0] != institution:
+            self.conn.execute(
+                "INSERT INTO changes (id, old, new, changed_at) VALUES (?, ?, ?, ?)",
+                (profile_id, previous[0], institution, now),
+            )
+        self.conn.execute(
+            "INSERT OR REPLACE INTO profiles (id, institution, fetched_at, fingerprint) VALUES (?, ?, ?, ?)",
+            (profile_id, institution, now, fingerprint),
+        )
+        self.conn.commit()
+
+    def changes(self, since=0):
+        """
+        Returns (id, old, new, changed_at) for every change of institution since the given time.
+        """
+        return self.conn.execute(
+            "SELECT id, old, new, changed_at FROM changes WHERE changed_at >= ? ORDER BY changed_at", (since,)
+        ).fetchall()
+
+    def summary(self):
+        total = self.hits + self.misses
+        rate = self.hits / total if total else 0
+        return f"profile cache: {self.hits} hits, {self.misses} misses ({rate:.0%} hit rate)"
+
+    def close(self):
+        self.conn.close()
+
+
+_profile_cache = None
+
+
+def configure_profile_cache(path=PROFILE_CACHE_FILE, ttl=PROFILE_TTL):
+    """
+    Replaces the shared profile cache, e.g. with an empty in-memory one
+    (path=":memory:") so institutions are parsed again from the pages.
+    """
+    global _profile_cache
+    _profile_cache = ProfileCache(path, ttl)
+    return _profile_cache
+
+
+def get_profile_cache():
+    """
+    Returns the shared profile cache, opening it on first use.
+    """
+    global _profile_cache
+    if _profile_cache is None:
+        _profile_cache = ProfileCache()
+    return _profile_cache
+
+
+def profile_id_of(profile_link):
+    return parse_qs(urlparse(profile_link).query).get("id", [profile_link])[0]
+
+
+def parse_forum(html, base_url=BASE_URL):
+    """
+    Extracts title, abstract, authors, keywords and profile links from an
+    OpenReview forum page in one streaming pass (see fastparse).
+    """
+    return fastparse.parse_openreview_forum(html, base_url)
+
+
+def parse_forum_soup(html, base_url=BASE_URL):
+    """
+    Reference BeautifulSoup parser for parse_forum, kept to check the fast
+    path against (utils/bench_parse.py). Returns a dictionary of:
+      - title
+      - abstract
+      - authors (list)
+      - keywords (list)
+      - profile_links (list)
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    forum = {}
+
+    title_tag = soup.find("h2", class_="citation_title")
+    forum["title"] = title_tag.text.strip() if title_tag else ""
+
+    # abstract comes from the description meta tag, falling back to og:description
+    meta_description = soup.find("meta", attrs={"name": "description"})
+    if not meta_description:
+        meta_description = soup.find("meta", property="og:description")
+    forum["abstract"] = meta_description.get("content", "").strip() if meta_description else ""
+
+    author_metas = soup.find_all("meta", attrs={"name": "citation_author"})
+    forum["authors"] = [m.get("content", "").strip() for m in author_metas]
+
+    # the first note field on the page holds the comma separated keywords
+    keywords_span = soup.find("span", class_="note-content-value")
+    if keywords_span:
+        forum["keywords"] = [kw.strip() for kw in keywords_span.text.strip().split(",")]
+    else:
+        forum["keywords"] = []
+
+    forum["profile_links"] = [
+        urljoin(base_url, a.get("href"))
+        for a in soup.find_all("a")
+        if a.get("href") and "/profile?id" in a.get("href")
+    ]
+    return forum
+
+
+async def extract_forum(crawler, url):
+    """
+    Fetches an OpenReview forum page once and returns the fields parsed from it.
+    """
+    response = await crawler.get(url)
+    response.raise_for_status()
+    with telemetry.timer("crawl_parse_seconds", kind="openreview_forum"):
+        return parse_forum(response.text, response.url)
+
+
+def parse_institution(html):
+    """
+    Returns the current institution listed on an OpenReview profile page,
+    with the trailing domain in parentheses removed.
+    """
+    return fastparse.parse_openreview_institution(html)
+
+
+def parse_institution_soup(html):
+    """
+    Reference BeautifulSoup parser for parse_institution.
+    """
+    soup = BeautifulSoup(html, "html.parser")
+    inst = soup.find("div", class_="institution")
+    if not inst:
+        return ""
+    return re.sub(r"\s*\(\S*?\.\S*?\)$", "", inst.text.strip()).strip()
+
+
+async def fetch_institution(crawler, profile_link, profile_id, cache):
+    resp = await crawler.get(profile_link)
+    # a missing profile has no institution, but any other error page must not
+    # end up in the CSV (or the cache) as an empty affiliation
+    if resp.status_code == 404:
+        return ""
+    resp.raise_for_status()
+    fingerprint = hashlib.sha256(resp.content).hexdigest()
+    stored = cache.stored(profile_id)
+    if stored is not None and stored[1] == fingerprint:
+        # same page as last time, no need to parse it again
+        institution = stored[0]
+    else:
+        with telemetry.timer("crawl_parse_seconds", kind="openreview_profile"):
+            institution = parse_institution(resp.text)
+    cache.put(profile_id, institution, fingerprint)
+    return institution
+
+
+# profile fetches in progress, so papers sharing an author wait on one request
+_pending_profiles = {}
+
+
+async def get_institution(crawler, profile_link, cache):
+    profile_id = profile_id_of(profile_link)
+    if profile_id in _pending_profiles:
+        cache.hits += 1
+        telemetry.count("crawl_cache_lookups_total", cache="profiles", result="hit")
+        return await asyncio.shield(_pending_profiles[profile_id])
+    institution = cache.get(profile_id)
+    if institution is not None:
+        return institution
+    task = asyncio.ensure_future(fetch_institution(crawler, profile_link, profile_id, cache))
+    _pending_profiles[profile_id] = task
+    try:
+        return await asyncio.shield(task)
+    finally:
+        _pending_profiles.pop(profile_id, None)
+
+
+async def get_author_affiliations(crawler, profile_links, cache=None):
+    """
+    Returns the authors' institutions in order, fetching concurrently only
+    the profiles that are not already in the profile cache.
+    """
+    if cache is None:
+        cache = get_profile_cache()
+    return list(await asyncio.gather(*(get_institution(crawler, link, cache) for link in profile_links)))
+
+
+def note_value(content, key, default):
+    # API v2 wraps every field as {"value": ...}, API v1 does not
+    value = content.get(key, default)
+    if isinstance(value, dict):
+        return value.get("value", default)
+    return value
+
+
+def parse_note(note, base_url=BASE_URL):
+    """
+    Converts an OpenReview API note into the same fields parse_forum returns,
+    plus the forum link.
+    """
+    content = note.get("content", {})
+    forum_id = note.get("forum") or note.get("id")
+    keywords = note_value(content, "keywords", [])
+    if isinstance(keywords, str):
+        keywords = [kw.strip() for kw in keywords.split(",")]
+    return {
+        "link": urljoin(base_url, f"/forum?id={forum_id}"),
+        "title": note_value(content, "title", "").strip(),
+        "abstract": note_value(content, "abstract", "").strip(),
+        "authors": note_value(content, "authors", []),
+        "keywords": keywords,
+        "profile_links": [
+            urljoin(base_url, f"/profile?id={author_id}")
+            for author_id in note_value(content, "authorids", [])
+        ],
+    }
+
+
+async def get_notes_page(crawler, venue_id, offset, api_url=API_URL, page_size=API_PAGE_SIZE):
+    response = await crawler.get(
+        urljoin(api_url, "notes"),
+        params={"content.venueid": venue_id, "offset": offset, "limit": page_size},
+    )
+    response.raise_for_status()
+    return response.json()
+
+
+async def get_venue_forums(crawler, venue_id, api_url=API_URL, base_url=BASE_URL, page_size=API_PAGE_SIZE):
+    """
+    Pulls every accepted submission of a venue (e.g. "ICLR.cc/2024/Conference")
+    from the OpenReview notes API in pages of page_size. The first page tells
+    us the total count, the remaining pages are fetched concurrently.
+    """
+    first = await get_notes_page(crawler, venue_id, 0, api_url, page_size)
+    notes = first.get("notes", [])
+    count = first.get("count", len(notes))
+    rest = await asyncio.gather(*(
+        get_notes_page(crawler, venue_id, offset, api_url, page_size)
+        for offset in range(len(notes), count, page_size)
+    )) if notes else []
+    for page in rest:
+        notes.extend(page.get("notes", []))
+    return [parse_note(note, base_url) for note in notes]
@@ -0,0 +1,78 @@
+import categories
+import engine
+import openreview
+
+
+class OpenReviewVenue(engine.Venue):
+    """
+    A conference reviewed on OpenReview (ICLR, ICML, NeurIPS). Papers come
+    from the forum links in links/<name><year>_openreview_links.txt, or with
+    --bulk from the notes API; institutions come from the authors' profile
+    pages, fetched only for papers that are kept.
+    """
+
+    # e.g. "ICLR.cc" and 2024 for the venue "ICLR.cc/2024/Conference"; the
+    # year also picks the links file, so one venue's years are never mixed
+    venue_group = None
+    year = None
+    # every kept paper costs a forum page plus one page per author
+    http2_hosts = ("openreview.net", "api2.openreview.net")
+    # whether the authors' own keywords are saved and count for the category
+    use_keywords = True
+    # whether line breaks in abstracts are replaced by spaces
+    flatten_abstract = True
+
+    @property
+    def venue_id(self):
+        return f"{self.venue_group}/{self.year}/Conference"
+
+    @property
+    def links_file(self):
+        return openreview.links_file(self.name, self.year)
+
+    def add_arguments(self, parser):
+        parser.add_argument("--bulk", action="store_true",
+                            help=f"ingest the venue's accepted papers from the OpenReview API instead of {self.links_file}")
+        parser.add_argument("--api-url", default=openreview.API_URL)
+        parser.add_argument("--site-url", default=openreview.BASE_URL)
+
+    def configure(self, args):
+        self.bulk = args.bulk
+        self.api_url = args.api_url
+        self.site_url = args.site_url
+        if args.refresh:
+            openreview.configure_profile_cache(ttl=openreview.PROFILE_REFRESH_AGE)
+
+    async def discover(self, crawler):
+        if self.bulk:
+            forums = await openreview.get_venue_forums(crawler, self.venue_id, self.api_url, self.site_url)
+            print(f"Found {len(forums)} papers for {self.venue_id}")
+            return {forum["link"]: forum for forum in forums}
+        with open(self.links_file, "r", encoding="utf-8") as f:
+            return dict.fromkeys(line.strip() for line in f if line.strip())
+
+    async def extract(self, crawler, link, forum=None):
+        if forum is None:
+            forum = await openreview.extract_forum(crawler, link)
+        title = forum["title"]
+        abstract = forum["abstract"].replace("\n", " ") if self.flatten_abstract else forum["abstract"]
+        keywords = forum["keywords"] if self.use_keywords else []
+        category = categories.get_category([title, abstract], keywords)
+        if not category:
+            return None
+        # author profiles cost one request each, so only fetch them for papers we keep
+        author_affiliations = await openreview.get_author_affiliations(crawler, forum["profile_links"])
+        return {
+            "link": link,
+            "category": category,
+            "title": title,
+            "abstract": abstract,
+            "keywords": keywords,
+            "ccs_concepts": "",
+            "author_names": forum["authors"],
+            "author_affiliations": author_affiliations,
+            "author_countries": ""
+        }
+
+    def report(self):
+        print(openreview.get_profile_cache().summary())
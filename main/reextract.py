@@ -0,0 +1,86 @@
+import asyncio
+import concurrent.futures
+import os
+import archive
+import crawl
+import http_client
+import openreview
+
+
+def get(url, params=None, **kwargs):
+    """
+    Offline stand-in for http_client.get: the newest archived version of the
+    page (a 404 for pages that were missing when crawled), falling back to
+    the response cache for pages fetched before the archive existed. Never
+    touches the network.
+    """
+    key = http_client.cache_key(url, params)
+    page_archive = http_client.get_archive()
+    record = page_archive.latest(key)
+    if record is not None:
+        return page_archive.build_response(record)
+    cache = http_client.get_cache()
+    entry = cache.lookup(key)
+    if entry is not None:
+        return cache.build_response(entry)
+    raise archive.NotArchived(f"{key} is not in the archive")
+
+
+class ArchivedCrawler:
+    """
+    Drop-in for crawl.Crawler that serves every request from the archive,
+    so the async scrapers run unchanged without any network or politeness
+    delays.
+    """
+
+    async def get(self, url, **kwargs):
+        return get(url, **kwargs)
+
+    map = crawl.Crawler.map
+
+    def close(self):
+        pass
+
+
+def _init_worker():
+    # sqlite handles must not be shared with the parent across fork, and
+    # profile pages are parsed again instead of read from the profile cache
+    http_client.configure_cache()
+    http_client.configure_archive()
+    openreview.configure_profile_cache(":memory:")
+
+
+def _extract(extract, args):
+    return asyncio.run(extract(ArchivedCrawler(), *args))
+
+
+def run(jobs, extract, workers=None):
+    """
+    Runs the async scraper function extract(crawler, *args) for every args
+    tuple in jobs on a pool of worker processes, each with an
+    ArchivedCrawler. extract must be a module-level function. Yields
+    (args, result, error) as each job finishes.
+    """
+    workers = workers or os.cpu_count() or 1
+    with concurrent.futures.ProcessPoolExecutor(max_workers=workers, initializer=_init_worker) as pool:
+        futures = {pool.submit(_extract, extract, args): args for args in jobs}
+        for future in concurrent.futures.as_completed(futures):
+            if future.exception() is not None:
+                yield futures[future], None, future.exception()
+            else:
+                yield futures[future], future.result(), None
+
+
+def output_path(csv_file):
+    """
+    Where a re-extraction writes instead of the crawl output,
+    e.g. data/iclr_papers.csv -> data/iclr_papers.reextract.csv.
+    """
+    root, ext = os.path.splitext(csv_file)
+    return f"{root}.reextract{ext}"
+
+
+def add_reextract_argument(parser):
+    parser.add_argument("--reextract", action="store_true",
+                        help="re-run the extractors over archived pages on every core, without "
+                             "network access, writing to <output>.reextract.csv")
@@ -0,0 +1,93 @@
+import hashlib
+import json
+import frontier
+import http_client
+import retry
+import sink
+import telemetry
+
+
+def fingerprint(row):
+    """
+    Content fingerprint of a paper's extracted row (None for a rejected paper).
+    """
+    return hashlib.sha256(json.dumps(row).encode("utf-8")).hexdigest()
+
+
+def diff(old_row, new_row):
+    """
+    Returns the (field, old, new) changes between two rows, either of which
+    may be None for a paper that is not in the CSV.
+    """
+    if old_row is None and new_row is None:
+        return []
+    if old_row is None:
+        return [("status", frontier.REJECTED, frontier.FETCHED)]
+    if new_row is None:
+        return [("status", frontier.FETCHED, frontier.REJECTED)]
+    return [(column, old, new) for column, old, new in zip(sink.HEADER, old_row, new_row) if old != new]
+
+
+def configure():
+    """
+    Sets up a refresh run: pages are revalidated instead of reused from the
+    response cache, so unchanged ones come back as cheap 304s.
+    """
+    http_client.configure_cache(max_age=0)
+
+
+async def refresh(crawler, journal, csv_file, visit, venue, limit=None):
+    """
+    Re-crawls papers already in the journal, least recently checked first
+    (only the `limit` stalest if given), and brings csv_file up to date.
+    visit(link) returns the paper dict, or None if the paper no longer
+    qualifies. Only the rows whose fingerprint changed are rewritten; what
+    changed goes to the journal's changes table. Returns {link: new row or
+    None} for the changed papers.
+    """
+    rows = sink.read_rows(csv_file)
+    links = journal.stalest(limit)
+    print(f"Refreshing {len(links)} papers, stalest first")
+
+    updates = {}
+    checked = []
+    failed = 0
+    dead_letters = retry.DeadLetters()
+    todo = links
+    while todo:
+        async for link, paper, error in crawler.map(visit, todo):
+            if error:
+                retried = dead_letters.add(link, retry.host_of(link))
+                if not retried:
+                    failed += 1
+                print(f"Error refreshing {link}: {error}" + (" (will retry)" if retried else ""))
+                continue
+            new_row = sink.paper_row(paper) if paper else None
+            old_row = rows.get(link)
+            new_fingerprint = fingerprint(new_row)
+            # journals from before refresh existed have no fingerprint yet
+            old_fingerprint = journal.fingerprint(link) or fingerprint(old_row)
+            changes = diff(old_row, new_row) if new_fingerprint != old_fingerprint else []
+            if changes:
+                updates[link] = new_row
+                print(f"Changed: {link} ({', '.join(field for field, _, _ in changes)})")
+            checked.append((link, frontier.FETCHED if paper else frontier.REJECTED, new_fingerprint, changes))
+            telemetry.count("crawl_papers_total", venue=venue, outcome="changed" if changes else "unchanged")
+        todo = await dead_letters.requeue_async()
+
+    # the journal only learns the new fingerprints once the CSV has them, so
+    # an interrupted refresh finds the same changes again next time
+    if updates:
+        sink.rewrite_rows(csv_file, updates)
+    for args in checked:
+        journal.checked(*args)
+    print(f"Refreshed {len(links)} papers: {len(updates)} changed, {failed} failed")
+    return updates
+
+
+def add_refresh_arguments(parser):
+    parser.add_argument("--refresh", action="store_true",
+                        help="re-crawl papers already fetched, stalest first, and rewrite only the rows "
+                             "whose fields changed (recorded in the frontier's changes table)")
+    parser.add_argument("--refresh-limit", type=int,
+                        help="refresh only this many of the least recently checked papers")
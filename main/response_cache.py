@@ -0,0 +1,130 @@
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+import zlib
+import requests
+from requests.structures import CaseInsensitiveDict
+import telemetry
+
+RESPONSE_CACHE_DIR = "cache/responses"
+
+# cached pages younger than this are reused without asking the server again
+CACHE_MAX_AGE = 24 * 60 * 60
+
+# ResponseCache.count kinds as reported to telemetry
+LOOKUP_RESULTS = {"hits": "hit", "revalidated": "revalidated", "misses": "miss"}
+
+
+class ResponseCache:
+    """
+    On-disk HTTP response cache. Bodies are zlib-compressed and stored by the
+    sha256 of their content under bodies/, so identical pages are kept once;
+    index.sqlite maps each URL to its body, headers, ETag and Last-Modified.
+    """
+
+    def __init__(self, path=RESPONSE_CACHE_DIR, max_age=CACHE_MAX_AGE):
+        self.path = path
+        self.max_age = max_age
+        self.counts = {"hits": 0, "revalidated": 0, "misses": 0}
+        self.lock = threading.Lock()
+        os.makedirs(os.path.join(path, "bodies"), exist_ok=True)
+        self.conn = sqlite3.connect(os.path.join(path, "index.sqlite"), timeout=30, check_same_thread=False)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS responses ("
+            "url TEXT PRIMARY KEY, final_url TEXT NOT NULL, digest TEXT NOT NULL, "
+            "headers TEXT NOT NULL, etag TEXT, last_modified TEXT, fetched_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def _body_path(self, digest):
+        return os.path.join(self.path, "bodies", digest[:2], digest + ".z")
+
+    def lookup(self, url):
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT final_url, digest, headers, etag, last_modified, fetched_at "
+                "FROM responses WHERE url = ?", (url,)
+            ).fetchone()
+        if row is None or not os.path.exists(self._body_path(row[1])):
+            return None
+        keys = ["final_url", "digest", "headers", "etag", "last_modified", "fetched_at"]
+        return dict(zip(keys, row))
+
+    def is_fresh(self, entry):
+        return entry is not None and time.time() - entry["fetched_at"] < self.max_age
+
+    def conditional_headers(self, entry):
+        headers = {}
+        if entry is None:
+            return headers
+        if entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def store(self, url, response):
+        body = response.content
+        digest = hashlib.sha256(body).hexdigest()
+        body_path = self._body_path(digest)
+        if not os.path.exists(body_path):
+            os.makedirs(os.path.dirname(body_path), exist_ok=True)
+            tmp_path = f"{body_path}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(zlib.compress(body))
+            os.replace(tmp_path, body_path)
+        with self.lock:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, final_url, digest, headers, etag, last_modified, fetched_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (
+                    url,
+                    response.url,
+                    digest,
+                    json.dumps(dict(response.headers)),
+                    response.headers.get("ETag"),
+                    response.headers.get("Last-Modified"),
+                    time.time(),
+                ),
+            )
+            self.conn.commit()
+
+    def touch(self, url):
+        """
+        Marks an entry as just revalidated by the server.
+        """
+        with self.lock:
+            self.conn.execute("UPDATE responses SET fetched_at = ? WHERE url = ?", (time.time(), url))
+            self.conn.commit()
+
+    def build_response(self, entry):
+        """
+        Rebuilds a requests.Response from a cache entry.
+        """
+        with open(self._body_path(entry["digest"]), "rb") as f:
+            body = zlib.decompress(f.read())
+        response = requests.Response()
+        response.status_code = 200
+        response._content = body
+        response.headers = CaseInsensitiveDict(json.loads(entry["headers"]))
+        response.url = entry["final_url"]
+        response.encoding = requests.utils.get_encoding_from_headers(response.headers)
+        return response
+
+    def count(self, kind):
+        with self.lock:
+            self.counts[kind] += 1
+        telemetry.count("crawl_cache_lookups_total", cache="responses", result=LOOKUP_RESULTS[kind])
+
+    def summary(self):
+        hits, revalidated, misses = self.counts["hits"], self.counts["revalidated"], self.counts["misses"]
+        total = hits + revalidated + misses
+        rate = (hits + revalidated) / total if total else 0
+        return (
+            f"response cache: {hits} fresh hits, {revalidated} revalidated (304), "
+            f"{misses} misses ({rate:.0%} hit rate)"
+        )
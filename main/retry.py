@@ -0,0 +1,283 @@
+import asyncio
+import random
+import threading
+import time
+from urllib.parse import urlparse
+import requests
+import http_client
+import telemetry
+
+# responses worth asking again for; anything else is returned to the caller
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RETRY_ERRORS = (requests.Timeout, requests.ConnectionError)
+
+MAX_ATTEMPTS = 5
+BASE_DELAY = 1.0
+MAX_DELAY = 60.0
+
+# consecutive failures that open a host's circuit, and how long it stays open
+FAILURE_THRESHOLD = 5
+RESET_TIMEOUT = 60.0
+
+# extra passes over the dead-letter list at the end of a run
+DEAD_LETTER_ROUNDS = 2
+
+# hosts that only redirect to another host share that host's breaker (and,
+# in crawl.Crawler, its politeness budget)
+HOST_ALIASES = {
+    "doi.org": "dl.acm.org",
+}
+
+
+class CircuitOpenError(requests.ConnectionError):
+    """
+    Raised instead of sending a request to a host whose circuit is open.
+    """
+
+
+def backoff(attempt, response=None):
+    """
+    Seconds to wait before retry number attempt + 1: exponential with full
+    jitter, or the server's Retry-After if it asks for longer.
+    """
+    delay = random.uniform(0, min(MAX_DELAY, BASE_DELAY * 2 ** attempt))
+    retry_after = response.headers.get("Retry-After", "") if response is not None else ""
+    if retry_after.isdigit():
+        delay = max(delay, min(MAX_DELAY, float(retry_after)))
+    return delay
+
+
+def host_of(url):
+    """
+    The host a request to url counts against, for circuit breakers,
+    politeness budgets and dead letters alike.
+    """
+    host = urlparse(url).hostname or ""
+    if host.startswith("www."):
+        host = host[4:]
+    return HOST_ALIASES.get(host, host)
+
+
+def throttled(response):
+    # a throttled host is up, so this is handled by backing off, not by the breaker
+    return response is not None and response.status_code == 429
+
+
+def retryable(response=None, error=None):
+    if error is not None:
+        return isinstance(error, RETRY_ERRORS) and not isinstance(error, CircuitOpenError)
+    return response.status_code in RETRY_STATUSES
+
+
+class CircuitBreaker:
+    """
+    Per-host circuit breaker. After FAILURE_THRESHOLD failed requests in a
+    row (errors and 5xx; 429s are only backed off) the circuit opens and
+    requests to the host fail straight away with CircuitOpenError; after
+    RESET_TIMEOUT one trial request is let through, and its outcome closes
+    the circuit again or reopens it.
+    """
+
+    def __init__(self, host, threshold=FAILURE_THRESHOLD, reset_timeout=RESET_TIMEOUT):
+        self.host = host
+        self.threshold = threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self.trial = False
+        self.lock = threading.Lock()
+
+    def check(self):
+        """
+        Raises CircuitOpenError while the circuit is open. Returns True if
+        the caller's request is the trial, which it must finish with record
+        or release_trial.
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return False
+            if self.trial or time.monotonic() - self.opened_at < self.reset_timeout:
+                raise CircuitOpenError(f"circuit open for {self.host}")
+            self.trial = True
+            return True
+
+    def record(self, ok):
+        with self.lock:
+            self.trial = False
+            if ok:
+                if self.opened_at is not None:
+                    print(f"[retry] {self.host}: circuit closed")
+                self.failures = 0
+                self.opened_at = None
+                return
+            self.failures += 1
+            if self.opened_at is not None or self.failures >= self.threshold:
+                if self.opened_at is None:
+                    print(f"[retry] {self.host}: circuit opened after {self.failures} failures")
+                self.opened_at = time.monotonic()
+
+    def release_trial(self, reopen=False):
+        """
+        Ends a trial request that told nothing about the host (e.g. it was
+        cancelled), so the next request is let through as a new trial. With
+        reopen (the trial was throttled) that waits another reset_timeout.
+        """
+        with self.lock:
+            self.trial = False
+            if reopen and self.opened_at is not None:
+                self.opened_at = time.monotonic()
+
+    def remaining(self):
+        """
+        Seconds until an open circuit lets a trial request through.
+        """
+        with self.lock:
+            if self.opened_at is None:
+                return 0.0
+            return max(0.0, self.reset_timeout - (time.monotonic() - self.opened_at))
+
+
+_breakers = {}
+_lock = threading.Lock()
+
+
+def breaker_for(host):
+    with _lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
+
+
+def cooldown(hosts=None):
+    """
+    Seconds until every open circuit (of the given hosts only, if any) is
+    ready for a trial request again.
+    """
+    with _lock:
+        breakers = [breaker for host, breaker in _breakers.items() if hosts is None or host in hosts]
+    return max([breaker.remaining() for breaker in breakers], default=0.0)
+
+
+class Attempt:
+    """
+    One try at url behind its host's circuit breaker, shared by get and
+    crawl.Crawler.get. Wrap the request in it and set response; timeouts and
+    connection errors raised inside are kept as error instead. Afterwards
+    delay is the backoff before the next attempt, or None if this one is
+    final (it succeeded, failed for good, or was attempt MAX_ATTEMPTS).
+    """
+
+    def __init__(self, url, number):
+        self.url = url
+        self.number = number
+        self.host = host_of(url)
+        self.breaker = breaker_for(self.host)
+        self.response = None
+        self.error = None
+        self.delay = None
+        self.trial = False
+
+    def __enter__(self):
+        self.trial = self.breaker.check()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc is not None and not isinstance(exc, RETRY_ERRORS):
+            # anything else (a redirect loop, cancellation) still ends the
+            # trial, or the circuit would stay open for the rest of the run
+            if self.trial:
+                self.breaker.release_trial()
+            return False
+        self.error = exc
+        failed = retryable(self.response, self.error)
+        if not throttled(self.response):
+            self.breaker.record(not failed)
+        elif self.trial:
+            # a 429 is no failure, but a throttled host gets no trial for a while
+            self.breaker.release_trial(reopen=True)
+        if failed and self.number < MAX_ATTEMPTS - 1:
+            print(f"[retry] {self.url}: attempt {self.number + 1} failed "
+                  f"({self.error or self.response.status_code}), retrying")
+            telemetry.count("crawl_retries_total", host=self.host)
+            self.delay = backoff(self.number, self.response)
+        return True
+
+    def result(self):
+        """
+        The response of a final attempt, or its error raised.
+        """
+        if self.error is not None:
+            raise self.error
+        return self.response
+
+
+def get(url, fetch=http_client.get, **kwargs):
+    """
+    Calls fetch(url) with exponential backoff on timeouts, connection errors
+    and RETRY_STATUSES, behind the host's circuit breaker. Returns the last
+    response (which may still be an error status) or raises the last error.
+    """
+    for number in range(MAX_ATTEMPTS):
+        with Attempt(url, number) as attempt:
+            attempt.response = fetch(url, **kwargs)
+        if attempt.delay is None:
+            break
+        time.sleep(attempt.delay)
+    return attempt.result()
+
+
+class DeadLetters:
+    """
+    Items that failed even after their retries. They are parked here instead
+    of ending the run, and requeue() hands them back for another pass once
+    the crawl is otherwise done, up to DEAD_LETTER_ROUNDS times.
+    """
+
+    def __init__(self, rounds=DEAD_LETTER_ROUNDS):
+        self.rounds = rounds
+        self.round = 0
+        self.items = []
+        self.hosts = set()
+
+    def add(self, item, host=None):
+        """
+        Parks item for a later pass; host is the one the item is fetched
+        from, whose circuit the pass waits for. Returns False when no passes
+        are left, i.e. the failure is final.
+        """
+        if self.round >= self.rounds:
+            return False
+        self.items.append(item)
+        if host is not None:
+            self.hosts.add(host)
+        return True
+
+    def _next_pass(self):
+        # the parked items and how long their hosts' circuits stay open
+        items, self.items = self.items, []
+        hosts, self.hosts = self.hosts, set()
+        if not items:
+            return items, 0.0
+        self.round += 1
+        wait = cooldown(hosts or None)
+        print(f"[retry] re-queueing {len(items)} failed items (pass {self.round}/{self.rounds}), waiting {wait:.0f}s")
+        return items, wait
+
+    def requeue(self):
+        """
+        Returns the parked items for another pass, first waiting for the
+        open circuits of their hosts (of every host if none were given) to
+        let requests through again.
+        """
+        items, wait = self._next_pass()
+        time.sleep(wait)
+        return items
+
+    async def requeue_async(self):
+        """
+        requeue for async crawls: waits without blocking the event loop, so
+        other crawls sharing it carry on in the meantime.
+        """
+        items, wait = self._next_pass()
+        await asyncio.sleep(wait)
+        return items
@@ -0,0 +1,110 @@
+import argparse
+import csv
+import hashlib
+import os
+import re
+
+
+def parse_shard(value):
+    """
+    Parses a "k/N" shard spec (1 <= k <= N) into (k, N); for use as an argparse type.
+    """
+    try:
+        k, n = (int(part) for part in value.split("/"))
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"shard must look like k/N, got {value!r}")
+    if not 1 <= k <= n:
+        raise argparse.ArgumentTypeError(f"shard {value!r} is out of range, need 1 <= k <= N")
+    return k, n
+
+
+def add_shard_argument(parser):
+    parser.add_argument("--shard", type=parse_shard, default=None, metavar="k/N",
+                        help="only crawl the k-th of N hash partitions of the links")
+
+
+def in_shard(link, shard):
+    """
+    Assigns every link to one shard by a stable hash, so any process or
+    machine computes the same split.
+    """
+    if shard is None:
+        return True
+    k, n = shard
+    digest = hashlib.sha1(link.encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % n == k - 1
+
+
+def filter_links(links, shard):
+    return [link for link in links if in_shard(link, shard)]
+
+
+def shard_name(name, shard):
+    """
+    Suffixes an output path or journal name with the shard,
+    e.g. data/iclr_papers.csv -> data/iclr_papers.shard2of4.csv.
+    """
+    if shard is None:
+        return name
+    root, ext = os.path.splitext(name)
+    return f"{root}.shard{shard[0]}of{shard[1]}{ext}"
+
+
+def find_shards(name):
+    """
+    The shard outputs of name (see shard_name) in shard order, e.g.
+    data/iclr_papers.shard1of4.csv through .shard4of4.csv for
+    data/iclr_papers.csv. Raises ValueError unless they are all there and
+    agree on N, so a missing shard can't go unnoticed in a merge.
+    """
+    root, ext = os.path.splitext(name)
+    pattern = re.compile(re.escape(os.path.basename(root)) + r"\.shard(\d+)of(\d+)" + re.escape(ext) + "$")
+    shards = {}
+    for file_name in os.listdir(os.path.dirname(root) or "."):
+        match = pattern.match(file_name)
+        if match:
+            shards[int(match.group(1)), int(match.group(2))] = os.path.join(os.path.dirname(root), file_name)
+    counts = {n for _, n in shards}
+    if len(counts) > 1:
+        raise ValueError(f"shard outputs of {name} disagree on the number of shards: {sorted(counts)}")
+    if not counts:
+        raise ValueError(f"no shard outputs of {name}")
+    n = counts.pop()
+    missing = [k for k in range(1, n + 1) if (k, n) not in shards]
+    if missing:
+        raise ValueError(f"shard outputs of {name} are missing shard(s) {', '.join(map(str, missing))} of {n}")
+    return [shards[k, n] for k in range(1, n + 1)]
+
+
+def merge_shards(file_paths, output_file):
+    """
+    Concatenates shard CSVs into output_file. Every input must have the same
+    header, and rows are deduplicated by link (first occurrence wins).
+    Returns the number of rows written.
+    """
+    header = None
+    seen = set()
+    rows = []
+    for file_path in file_paths:
+        with open(file_path, "r", newline="", encoding="utf-8") as f:
+            reader = csv.reader(f)
+            file_header = next(reader, None)
+            if header is None:
+                header = file_header
+                if not header or "link" not in header:
+                    raise ValueError(f"{file_path} has no link column")
+            elif file_header != header:
+                raise ValueError(f"{file_path} header {file_header} does not match {header}")
+            link_index = header.index("link")
+            for row in reader:
+                if not row or row[link_index] in seen:
+                    continue
+                seen.add(row[link_index])
+                rows.append(row)
+    if header is None:
+        raise ValueError("no shard files to merge")
+    with open(output_file, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(header)
+        writer.writerows(rows)
+    return len(rows)
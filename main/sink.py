@@ -0,0 +1,137 @@
+import csv
+import os
+import threading
+import time
+
+# columns of every scraper's output CSV
+HEADER = [
+    "link",
+    "category",
+    "title",
+    "abstract",
+    "keywords",
+    "ccs_concepts",
+    "author_names",
+    "author_affiliations",
+    "author_countries"
+]
+
+BATCH_SIZE = 50
+FLUSH_INTERVAL = 10
+
+
+class CsvSink:
+    """
+    Output CSV shared by all scrapers. The file stays open for the whole run;
+    rows are buffered and written out once BATCH_SIZE rows are waiting or
+    FLUSH_INTERVAL seconds have passed, and on close. Only complete rows ever
+    reach the file.
+
+    mode "a" appends to an existing output (writing the header if the file
+    is new), mode "w" starts it over. on_flush, if given, is called with the
+    papers just written, e.g. to mark them done in the crawl frontier only
+    once they are on disk.
+    """
+
+    def __init__(self, path, mode="a", batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL, on_flush=None):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        if mode == "a" and os.path.isfile(path) and os.path.getsize(path) > 0:
+            with open(path, "r", newline="", encoding="utf-8") as f:
+                existing = next(csv.reader(f), None)
+            if existing != HEADER:
+                raise ValueError(f"{path} has header {existing}, expected {HEADER}")
+            needs_header = False
+        else:
+            needs_header = True
+        self.path = path
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.on_flush = on_flush
+        self.lock = threading.Lock()
+        self.rows = []
+        self.written = 0
+        self.last_flush = time.monotonic()
+        self.file = open(path, mode, newline="", encoding="utf-8")
+        self.writer = csv.writer(self.file)
+        if needs_header:
+            self.writer.writerow(HEADER)
+            self.file.flush()
+
+    def write(self, paper):
+        """
+        Buffers one paper dict; its values are written in HEADER column order.
+        """
+        with self.lock:
+            self.rows.append(paper)
+            if len(self.rows) >= self.batch_size or time.monotonic() - self.last_flush >= self.flush_interval:
+                self._flush()
+
+    def _flush(self):
+        papers, self.rows = self.rows, []
+        self.writer.writerows([paper.get(column, "") for column in HEADER] for paper in papers)
+        self.file.flush()
+        self.written += len(papers)
+        self.last_flush = time.monotonic()
+        if self.on_flush and papers:
+            self.on_flush(papers)
+
+    def flush(self):
+        with self.lock:
+            self._flush()
+
+    def close(self):
+        with self.lock:
+            if not self.file.closed:
+                self._flush()
+                self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def paper_row(paper):
+    """
+    A paper dict as the row of strings CsvSink writes for it, which is also
+    what reading the row back from the CSV gives.
+    """
+    return ["" if paper.get(column) is None else str(paper.get(column, "")) for column in HEADER]
+
+
+def read_rows(path):
+    """
+    Returns {link: row} for every row of an output CSV, in file order.
+    """
+    if not os.path.isfile(path):
+        return {}
+    with open(path, "r", newline="", encoding="utf-8") as f:
+        reader = csv.reader(f)
+        if next(reader, None) not in (None, HEADER):
+            raise ValueError(f"{path} does not have the header {HEADER}")
+        return {row[0]: row for row in reader if row}
+
+
+def rewrite_rows(path, updates):
+    """
+    Applies {link: row or None} to an output CSV: rows of links already in
+    the file are replaced where they stand, None removes a row, and rows of
+    new links are appended. Every other row is written back unchanged. The
+    file is replaced atomically, so a crash leaves the old version intact.
+    """
+    rows = read_rows(path)
+    for link, row in updates.items():
+        if row is None:
+            rows.pop(link, None)
+        else:
+            rows[link] = row
+    if os.path.dirname(path):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as f:
+        writer = csv.writer(f)
+        writer.writerow(HEADER)
+        writer.writerows(rows.values())
+    os.replace(tmp_path, path)
@@ -0,0 +1,219 @@
+import http.server
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from urllib.parse import urlparse
+
+METRICS_DIR = "metrics"
+
+# upper bounds (seconds) of the latency, wait and parse time histograms
+BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+_counters = {}
+_histograms = {}
+_lock = threading.Lock()
+_started = time.time()
+
+
+def host_label(url):
+    return urlparse(url).hostname or ""
+
+
+def _key(name, labels):
+    return name, tuple(sorted(labels.items()))
+
+
+def count(name, amount=1, **labels):
+    """
+    Adds amount to the counter name{labels}.
+    """
+    key = _key(name, labels)
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+def observe(name, value, **labels):
+    """
+    Records one value (in seconds) in the histogram name{labels}.
+    """
+    key = _key(name, labels)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = {"buckets": [0] * len(BUCKETS), "count": 0, "sum": 0.0}
+        for i, bound in enumerate(BUCKETS):
+            if value <= bound:
+                histogram["buckets"][i] += 1
+        histogram["count"] += 1
+        histogram["sum"] += value
+
+
+@contextmanager
+def timer(name, **labels):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, **labels)
+
+
+def snapshot():
+    """
+    All metrics as plain data: counters and histograms as lists of
+    {"name", "labels", ...} entries, plus the run's elapsed time.
+    """
+    with _lock:
+        counters = [
+            {"name": name, "labels": dict(labels), "value": value}
+            for (name, labels), value in sorted(_counters.items())
+        ]
+        histograms = [
+            {
+                "name": name,
+                "labels": dict(labels),
+                "count": histogram["count"],
+                "sum": histogram["sum"],
+                "buckets": dict(zip(map(str, BUCKETS), histogram["buckets"])),
+            }
+            for (name, labels), histogram in sorted(_histograms.items())
+        ]
+    return {"started_at": _started, "elapsed": time.time() - _started, "counters": counters, "histograms": histograms}
+
+
+def total(name, **labels):
+    """
+    Sum of the counter name over every label set matching labels.
+    """
+    with _lock:
+        return sum(
+            value for (key, key_labels), value in _counters.items()
+            if key == name and all(item in key_labels for item in labels.items())
+        )
+
+
+def histogram_totals(name, group_by):
+    """
+    {label value: (count, sum)} for histogram name, grouped by one label.
+    """
+    totals = {}
+    with _lock:
+        for (key, labels), histogram in _histograms.items():
+            if key != name:
+                continue
+            group = dict(labels).get(group_by, "")
+            n, s = totals.get(group, (0, 0.0))
+            totals[group] = (n + histogram["count"], s + histogram["sum"])
+    return totals
+
+
+def report():
+    """
+    Short human-readable summary: where the time went per host, parse
+    time, accept rate, retries and cache hit ratio.
+    """
+    elapsed = time.time() - _started
+    lines = [f"telemetry: {elapsed:.0f}s elapsed"]
+    waits = histogram_totals("crawl_wait_seconds", "host")
+    for host, (n, latency) in sorted(histogram_totals("crawl_request_seconds", "host").items()):
+        wait_n, wait = waits.get(host, (0, 0.0))
+        lines.append(
+            f"  {host}: {n} requests ({n / elapsed:.1f}/s), "
+            f"{latency / n:.2f}s mean latency, "
+            f"{wait / wait_n if wait_n else 0:.2f}s mean politeness wait, "
+            f"{total('crawl_response_bytes_total', host=host) / 1e6:.2f} MB, "
+            f"{total('crawl_retries_total', host=host)} retries"
+        )
+    for kind, (n, parse) in sorted(histogram_totals("crawl_parse_seconds", "kind").items()):
+        lines.append(f"  parse {kind}: {n} pages, {parse:.1f}s total, {parse / n * 1000:.1f}ms mean")
+    accepted = total("crawl_papers_total", outcome="accepted")
+    seen = accepted + total("crawl_papers_total", outcome="rejected")
+    if seen:
+        lines.append(f"  papers: {accepted}/{seen} accepted ({accepted / seen:.0%}), "
+                     f"{total('crawl_papers_total', outcome='failed')} failed")
+    for cache in ("responses", "profiles"):
+        hits = total("crawl_cache_lookups_total", cache=cache, result="hit") \
+            + total("crawl_cache_lookups_total", cache=cache, result="revalidated")
+        lookups = total("crawl_cache_lookups_total", cache=cache)
+        if lookups:
+            lines.append(f"  {cache} cache: {hits}/{lookups} hits ({hits / lookups:.0%})")
+    return "\n".join(lines)
+
+
+def _label_value(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"')
+
+
+def _format_labels(labels, extra=None):
+    items = list(labels.items()) + list((extra or {}).items())
+    if not items:
+        return ""
+    return "{" + ",".join(f'{key}="{_label_value(value)}"' for key, value in items) + "}"
+
+
+def prometheus_text():
+    """
+    Current metrics in the Prometheus text exposition format.
+    """
+    data = snapshot()
+    lines = []
+    for name in sorted({counter["name"] for counter in data["counters"]}):
+        lines.append(f"# TYPE {name} counter")
+        for counter in data["counters"]:
+            if counter["name"] == name:
+                lines.append(f"{name}{_format_labels(counter['labels'])} {counter['value']}")
+    for name in sorted({histogram["name"] for histogram in data["histograms"]}):
+        lines.append(f"# TYPE {name} histogram")
+        for histogram in data["histograms"]:
+            if histogram["name"] != name:
+                continue
+            labels = histogram["labels"]
+            for bound, n in histogram["buckets"].items():
+                lines.append(f"{name}_bucket{_format_labels(labels, {'le': bound})} {n}")
+            lines.append(f"{name}_bucket{_format_labels(labels, {'le': '+Inf'})} {histogram['count']}")
+            lines.append(f"{name}_sum{_format_labels(labels)} {histogram['sum']}")
+            lines.append(f"{name}_count{_format_labels(labels)} {histogram['count']}")
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(http.server.BaseHTTPRequestHandler):
+    def do_GET(self):
+        body = prometheus_text().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/plain; version=0.0.4")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+def serve(port, host="127.0.0.1"):
+    """
+    Serves the metrics in Prometheus text format on host:port from a
+    background thread for the rest of the run.
+    """
+    server = http.server.ThreadingHTTPServer((host, port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"serving metrics on http://{host}:{port}/metrics")
+    return server
+
+
+def add_metrics_argument(parser):
+    parser.add_argument("--metrics-port", type=int,
+                        help="expose crawl metrics in Prometheus text format on this local port")
+
+
+def dump(name):
+    """
+    Writes every metric to metrics/<name>.json and prints the summary.
+    """
+    os.makedirs(METRICS_DIR, exist_ok=True)
+    path = os.path.join(METRICS_DIR, f"{name}.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(snapshot(), f, indent=2)
+    print(report())
+    print(f"metrics written to {path}")
+    return path
@@ -0,0 +1,194 @@
+import argparse
+import csv
+import json
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from urllib.parse import urlparse
+
+import mock_venues
+
+MAIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main")
+
+# shared modules live next to the scrapers in main/
+sys.path.insert(0, MAIN_DIR)
+import crawl_all
+
+# the scraper's own politeness budget would make every run measure the
+# default 1 request/s, so the mock hosts get a generous one by default
+MOCK_HOST_LIMIT = "200/50/16"
+
+VENUES = ["aaai", "aies", "iclr", "icml", "neurips", "facct"]
+FACCT_PAPERS = 9052 - 8537
+
+# with --together each site family is served on its own loopback address,
+# which the scrapers treat as a separate host, like ojs.aaai.org,
+# openreview.net and dl.acm.org
+FAMILY_ADDRESSES = {
+    "aaai": "127.0.0.2",
+    "aies": "127.0.0.2",
+    "iclr": "127.0.0.3",
+    "icml": "127.0.0.3",
+    "neurips": "127.0.0.3",
+    "facct": "127.0.0.4",
+}
+
+
+def scraper_args(venue, base_url, workdir, papers, bulk=False):
+    """
+    Options pointing main/<venue>.py at the mock server. OpenReview venues
+    read their forum links from workdir/links/ unless bulk is set.
+    """
+    if venue in ("aaai", "aies"):
+        return ["--index", f"{base_url}/index.php/{venue.upper()}/issue/archive"]
+    if venue == "facct":
+        return ["--doi-url", f"{base_url}/", "--acm-url", f"{base_url}/"]
+    if bulk:
+        return ["--bulk", "--api-url", f"{base_url}/", "--site-url", f"{base_url}/"]
+    links_file = os.path.join(workdir, crawl_all.VENUES[venue]().links_file)
+    os.makedirs(os.path.dirname(links_file), exist_ok=True)
+    with open(links_file, "w", encoding="utf-8") as f:
+        f.writelines(f"{base_url}/forum?id={venue}-{i}\n" for i in range(papers))
+    return []
+
+
+def run_venues(venues, names, papers, base_urls, bulk=False, keep=False, extra_args=(), extra_env=None,
+               host_limit=MOCK_HOST_LIMIT):
+    """
+    Runs main/<venue>.py, or main/crawl_all.py for several venues at once,
+    in a fresh working directory (empty caches, frontier and archive) and
+    returns its throughput, request count and peak RSS. base_urls gives the
+    mock address each venue crawls.
+    """
+    label = names[0] if len(names) == 1 else "all"
+    workdir = tempfile.mkdtemp(prefix=f"bench_{label}_")
+    if len(names) == 1:
+        command = [sys.executable, os.path.join(MAIN_DIR, f"{label}.py")]
+        command += scraper_args(label, base_urls[label], workdir, papers, bulk) + list(extra_args)
+    else:
+        command = [sys.executable, os.path.join(MAIN_DIR, "crawl_all.py"), "--venues", *names]
+        for name in names:
+            command += [f"--{name}-args", shlex.join(scraper_args(name, base_urls[name], workdir, papers, bulk))]
+        command += list(extra_args)
+    hosts = sorted({urlparse(base_urls[name]).hostname for name in names})
+    env = dict(os.environ, CRAWL_HOST_LIMITS=",".join(f"{host}={host_limit}" for host in hosts),
+               **(extra_env or {}))
+    requests_before = venues.requests()
+    log_path = os.path.join(workdir, "scraper.log")
+    start = time.perf_counter()
+    with open(log_path, "w", encoding="utf-8") as log:
+        process = subprocess.Popen(command, cwd=workdir, env=env, stdout=log, stderr=subprocess.STDOUT)
+        # wait4 reports the child's own peak RSS (and that of its reaped workers)
+        _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    processed = sum(FACCT_PAPERS if name == "facct" else papers for name in names)
+    requests = venues.requests() - requests_before
+    kept = 0
+    for name in names:
+        output = os.path.join(workdir, "data", f"{name}_papers.csv")
+        if os.path.exists(output):
+            with open(output, "r", newline="", encoding="utf-8") as f:
+                kept += max(0, sum(1 for _ in csv.reader(f)) - 1)
+    if os.waitstatus_to_exitcode(status) != 0:
+        with open(log_path, "r", encoding="utf-8") as f:
+            print(f.read()[-2000:])
+    if not keep:
+        shutil.rmtree(workdir, ignore_errors=True)
+    return {
+        "venue": label,
+        "exit_code": os.waitstatus_to_exitcode(status),
+        "papers": processed,
+        "kept": kept,
+        "seconds": elapsed,
+        "papers_per_second": processed / elapsed,
+        "requests": requests,
+        "requests_per_paper": requests / processed,
+        "peak_rss_mb": usage.ru_maxrss / 1024,
+        "workdir": workdir if keep else None,
+    }
+
+
+def print_result(label, result):
+    print(
+        f"{label:<12}{result['papers']:>8}{result['kept']:>7}{result['seconds']:>10.1f}"
+        f"{result['papers_per_second']:>10.1f}{result['requests_per_paper']:>11.2f}{result['peak_rss_mb']:>13.1f}"
+        + ("" if result["exit_code"] == 0 else f"  (exit code {result['exit_code']})")
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Run the scrapers end to end against the local mock venues and report "
+                    "papers/s, requests/paper and peak RSS."
+    )
+    parser.add_argument("venues", nargs="*", default=VENUES, help=f"any of {', '.join(VENUES)}")
+    mock_venues.add_profile_arguments(parser)
+    parser.add_argument("--bulk", action="store_true", help="OpenReview venues ingest from the notes API")
+    parser.add_argument("--json", help="also write the results to this file")
+    parser.add_argument("--keep", action="store_true", help="keep each run's working directory")
+    parser.add_argument("--http2", action="store_true",
+                        help="serve the mock over TLS with HTTP/2 (needs hypercorn) and run every venue twice, "
+                             "on the HTTP/1.1 pool and with --http2")
+    parser.add_argument("--together", action="store_true",
+                        help="serve OJS, OpenReview and ACM on separate addresses and, after the venues one at "
+                             "a time, crawl them all at once with main/crawl_all.py")
+    parser.add_argument("--host-limit", default=MOCK_HOST_LIMIT, metavar="RATE/BURST/CONCURRENCY",
+                        help="politeness budget of each mock host (default: %(default)s); a tight one shows "
+                             "how much of a crawl is spent waiting on it")
+    args = parser.parse_args()
+
+    if args.together and args.http2:
+        parser.error("--together and --http2 can't be combined")
+
+    venues = mock_venues.MockVenues(mock_venues.profile_from_args(args), args.papers)
+    # (label, extra scraper arguments) for each transport to compare
+    transports = [("", [])]
+    extra_env = {}
+    servers = []
+    if args.http2:
+        certfile, keyfile = mock_venues.make_certificate(tempfile.mkdtemp(prefix="bench_cert_"))
+        servers.append(mock_venues.Http2Server(venues, certfile, keyfile))
+        transports = [(" h1", []), (" h2", ["--http2", "127.0.0.1"])]
+        extra_env = {"SSL_CERT_FILE": certfile, "REQUESTS_CA_BUNDLE": certfile}
+    elif args.together:
+        # the same venues on one port of every family's address
+        for address in sorted(set(FAMILY_ADDRESSES.values())):
+            port = servers[0].server_address[1] if servers else 0
+            servers.append(mock_venues.serve(venues, port, address))
+    else:
+        servers.append(mock_venues.serve(venues))
+    if args.together:
+        base_urls = {venue: f"http://{FAMILY_ADDRESSES[venue]}:{servers[0].server_address[1]}" for venue in VENUES}
+    else:
+        base_urls = dict.fromkeys(VENUES, venues.base_url)
+    print(f"mock venues at {', '.join(sorted(set(base_urls.values())))} (profile {args.profile})")
+
+    results = []
+    print(f"{'venue':<12}{'papers':>8}{'kept':>7}{'seconds':>10}{'papers/s':>10}{'req/paper':>11}{'peak RSS MB':>13}")
+    for venue in args.venues:
+        for label, extra_args in transports:
+            result = run_venues(venues, [venue], args.papers, base_urls, args.bulk, args.keep, extra_args,
+                                extra_env, args.host_limit)
+            result["transport"] = label.strip() or None
+            results.append(result)
+            print_result(venue + label, result)
+    if args.together:
+        # every venue in one process, against the venues one after another
+        result = run_venues(venues, args.venues, args.papers, base_urls, args.bulk, args.keep,
+                            host_limit=args.host_limit)
+        result["transport"] = None
+        separate = sum(r["seconds"] for r in results)
+        results.append(result)
+        print_result("together", result)
+        print(f"together: {result['seconds']:.1f}s in one process, {separate:.1f}s one venue at a time "
+              f"({separate / result['seconds']:.1f}x)")
+    for server in servers:
+        server.shutdown()
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump({"profile": vars(mock_venues.profile_from_args(args)), "results": results}, f, indent=2)
@@ -0,0 +1,145 @@
+import argparse
+import os
+import sys
+import time
+
+# shared modules live next to the scrapers in main/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main"))
+import fastparse
+import http_client
+import ojs
+import openreview
+
+
+def padding(n):
+    # navigation, scripts and other markup the extractors have to skip over
+    items = "".join(f'<li class="nav-item"><a href="/page/{i}">Link {i}</a></li>' for i in range(n))
+    blob = "var x = '" + "a<b>c" * (n * 20) + "';"
+    return f'<nav><ul>{items}</ul></nav><script>{blob}</script><div class="sidebar">{"<p>filler text</p>" * n}</div>'
+
+
+def synthetic_ojs_page():
+    authors = "".join(
+        f'<meta name="citation_author" content="Author {i}">'
+        f'<meta name="citation_author_institution" content="University {i}">'
+        f'<meta name="citation_author_country" content="Country {i}">'
+        for i in range(6)
+    )
+    return (
+        "<html><head><title>Paper</title>"
+        '<meta name="citation_section" content="AAAI Technical Track on Machine Learning">'
+        f'<meta name="citation_title" content="Auditing Bias in Large Models">{authors}'
+        f"</head><body>{padding(300)}"
+        '<article><h1 class="page_title">Auditing Bias in Large Models</h1>'
+        '<section class="item abstract"><h2 class="label">Abstract</h2>'
+        + "<p>We study fairness and <em>bias</em> &amp; transparency.\nMore text here.</p>" * 20
+        + "</section>"
+        '<section class="item keywords"><h2 class="label">Keywords:</h2>'
+        '<span class="value">ML: Bias, ML: Transparency, Fairness</span></section>'
+        "</article>"
+        f"{padding(200)}</body></html>"
+    )
+
+
+def synthetic_openreview_forum():
+    authors = "".join(f'<meta name="citation_author" content="Author {i}">' for i in range(8))
+    profiles = "".join(f'<a href="/profile?id=~Author_{i}1">Author {i}</a>, ' for i in range(8))
+    return (
+        "<html><head>"
+        '<meta name="description" content="We study differential privacy.&#10;Second line.">'
+        f'<meta property="og:description" content="ignored">{authors}'
+        f"</head><body>{padding(300)}"
+        '<div class="forum-container"><h2 class="citation_title">Private Learning at Scale</h2>'
+        f'<div class="forum-authors"><h3>{profiles}</h3></div>'
+        '<div class="note-content"><strong>Keywords:</strong> '
+        '<span class="note-content-value">differential privacy, federated learning</span>'
+        '<strong>Abstract:</strong><span class="note-content-value">'
+        + "Long abstract text. " * 100
+        + "</span></div></div>"
+        f'<script id="__NEXT_DATA__" type="application/json">{{"x": "{"y" * 200000}"}}</script>'
+        "</body></html>"
+    )
+
+
+def synthetic_openreview_profile():
+    return (
+        f"<html><body>{padding(200)}"
+        '<div class="profile-container"><h1>Author</h1>'
+        '<div class="institution">Stanford University (stanford.edu)</div></div>'
+        "</body></html>"
+    )
+
+
+def cached_pages():
+    """
+    Real pages from the response cache, grouped by which extractor reads them.
+    """
+    cache = http_client.get_cache()
+    pages = {"ojs": [], "forum": [], "profile": []}
+    rows = cache.conn.execute("SELECT url FROM responses").fetchall()
+    for (url,) in rows:
+        kind = (
+            "ojs" if "/article/view/" in url
+            else "forum" if "forum?id=" in url
+            else "profile" if "profile?id=" in url
+            else None
+        )
+        if kind:
+            pages[kind].append((url, cache.build_response(cache.lookup(url)).text))
+    return pages
+
+
+def bench(fn, pages, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for url, html in pages:
+            fn(html, url)
+    return (time.perf_counter() - start) / (repeat * len(pages))
+
+
+PARSERS = {
+    "ojs": (
+        lambda html, url: ojs.parse_paper_attributes(html, url),
+        lambda html, url: fastparse.parse_ojs_paper(html, url),
+    ),
+    "forum": (
+        lambda html, url: openreview.parse_forum_soup(html, url),
+        lambda html, url: fastparse.parse_openreview_forum(html, url),
+    ),
+    "profile": (
+        lambda html, url: openreview.parse_institution_soup(html),
+        lambda html, url: fastparse.parse_openreview_institution(html),
+    ),
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Compare the BeautifulSoup extractors with the streaming fast path "
+                    "and check that both return the same fields."
+    )
+    parser.add_argument("--repeat", type=int, default=20)
+    parser.add_argument("--from-cache", action="store_true",
+                        help="benchmark on pages from cache/responses instead of synthetic ones")
+    args = parser.parse_args()
+
+    if args.from_cache:
+        pages = cached_pages()
+    else:
+        pages = {
+            "ojs": [("https://ojs.aaai.org/index.php/AAAI/article/view/1", synthetic_ojs_page())],
+            "forum": [("https://openreview.net/forum?id=abc", synthetic_openreview_forum())],
+            "profile": [("https://openreview.net/profile?id=~Author_01", synthetic_openreview_profile())],
+        }
+
+    print(f"{'page':<10}{'pages':>7}{'soup ms':>10}{'fast ms':>10}{'speedup':>10}  same output")
+    for kind, (soup_parser, fast_parser) in PARSERS.items():
+        if not pages[kind]:
+            continue
+        same = all(soup_parser(html, url) == fast_parser(html, url) for url, html in pages[kind])
+        soup_time = bench(soup_parser, pages[kind], args.repeat)
+        fast_time = bench(fast_parser, pages[kind], args.repeat)
+        print(
+            f"{kind:<10}{len(pages[kind]):>7}{soup_time * 1000:>10.2f}{fast_time * 1000:>10.2f}"
+            f"{soup_time / fast_time:>9.1f}x  {same}"
+        )
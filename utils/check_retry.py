@@ -0,0 +1,125 @@
+import argparse
+import asyncio
+import os
+import sys
+import tempfile
+import requests
+
+# shared modules live next to the scrapers in main/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main"))
+import crawl
+import retry
+
+
+def response(status):
+    resp = requests.Response()
+    resp.status_code = status
+    resp._content = b""
+    return resp
+
+
+def redirect_loop():
+    raise requests.TooManyRedirects("Exceeded 30 redirects.")
+
+
+def hang():
+    # never answers; the request is cancelled from outside
+    return asyncio.sleep(60)
+
+
+# what the half-open trial request runs into: (outcome, paths it applies
+# to, whether the circuit should stay open for another reset timeout)
+SCENARIOS = {
+    "redirect loop": (redirect_loop, ("retry.get", "Crawler.get"), False),
+    "cancelled": (hang, ("Crawler.get",), False),
+    "429": (lambda: response(429), ("retry.get", "Crawler.get"), True),
+}
+
+
+class ScriptedCrawler(crawl.Crawler):
+    """
+    crawl.Crawler whose requests return (or raise) outcome() instead of
+    going to the network.
+    """
+
+    def __init__(self, outcome):
+        super().__init__()
+        self.outcome = outcome
+
+    async def _fetch(self, host, url, **kwargs):
+        result = self.outcome()
+        if asyncio.iscoroutine(result):
+            result = await result
+        return result
+
+
+def via_retry(url, outcome):
+    return retry.get(url, fetch=lambda url, **kwargs: outcome())
+
+
+def via_crawler(url, outcome):
+    crawler = ScriptedCrawler(outcome)
+    try:
+        return asyncio.run(asyncio.wait_for(crawler.get(url), timeout=1))
+    finally:
+        crawler.close()
+
+
+PATHS = {"retry.get": via_retry, "Crawler.get": via_crawler}
+
+
+def open_circuit(host):
+    breaker = retry.breaker_for(host)
+    for _ in range(breaker.threshold):
+        breaker.record(False)
+    # as if RESET_TIMEOUT had passed, so the next request is the trial
+    breaker.opened_at -= breaker.reset_timeout
+    return breaker
+
+
+def check(path, scenario):
+    """
+    Sends the trial request of an open circuit into the scenario, then a
+    normal one (once the circuit's reset timeout is over again, if the
+    scenario reopens it). Returns a problem, or None if the breaker let the
+    second request through and closed again.
+    """
+    outcome, _, reopens = SCENARIOS[scenario]
+    url = f"https://{path}-{scenario}.example/page".replace(" ", "-").replace(".get", "")
+    breaker = open_circuit(retry.host_of(url))
+    try:
+        PATHS[path](url, outcome)
+    except (requests.RequestException, asyncio.TimeoutError):
+        pass
+    if breaker.trial:
+        return f"trial still in progress, remaining() = {breaker.remaining():.1f}s"
+    if reopens:
+        if breaker.remaining() < breaker.reset_timeout - 1:
+            return f"circuit not reopened, remaining() = {breaker.remaining():.1f}s"
+        breaker.opened_at -= breaker.reset_timeout
+    try:
+        PATHS[path](url, lambda: response(200))
+    except retry.CircuitOpenError as e:
+        return f"next request failed: {e}"
+    if breaker.opened_at is not None:
+        return "circuit still open after a successful request"
+    return None
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Check that the circuit breaker's half-open trial always ends, through both "
+                    "retry.get and crawl.Crawler.get, whatever the trial request runs into."
+    )
+    parser.parse_args()
+    # Crawler.get looks pages up in the response cache first
+    os.chdir(tempfile.mkdtemp(prefix="check_retry_"))
+
+    failures = 0
+    print(f"{'path':<14}{'trial':<16}result")
+    for scenario, (_, paths, _) in SCENARIOS.items():
+        for path in paths:
+            problem = check(path, scenario)
+            failures += problem is not None
+            print(f"{path:<14}{scenario:<16}{problem or 'ok'}")
+    sys.exit(1 if failures else 0)
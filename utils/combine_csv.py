@@ -1,39 +1,26 @@
-import pandas as pd
+import argparse
+import os
+import sys
 
-def combine_csv_files(file_paths, output_file):
-    dataframes = []
+# shared modules live next to the scrapers in main/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main"))
+import shard
 
-    for file_path in file_paths:
-        df = pd.read_csv(file_path)
-        dataframes.append(df)
 
-    combined_df = pd.concat(dataframes, ignore_index=True)
+def combine_csv_files(file_paths, output_file):
+    count = shard.merge_shards(file_paths, output_file)
+    print(f"Merged {len(file_paths)} files into {output_file} ({count} unique papers).")
 
-    combined_df.to_csv(output_file, index=False)
 
-aaai_files = [
-    "data/aaai_papers1.csv", 
-    "data/aaai_papers2.csv", 
-    "data/aaai_papers3.csv", 
-    "data/aaai_papers4.csv", 
-    "data/aaai_papers5.csv", 
-    "data/aaai_papers6.csv", 
-    "data/aaai_papers7.csv", 
-    "data/aaai_papers8.csv", 
-    "data/aaai_papers9.csv", 
-    "data/aaai_papers10.csv",
-    "data/aaai_papers11.csv",
-    "data/aaai_papers12.csv",
-    "data/aaai_papers13.csv",
-    "data/aaai_papers14.csv",
-    "data/aaai_papers15.csv",
-    "data/aaai_papers16.csv",
-    "data/aaai_papers17.csv",
-    "data/aaai_papers18.csv",
-    "data/aaai_papers19.csv",
-    "data/aaai_papers20.csv",
-    "data/aaai_papers21.csv"
-]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Merge scraper outputs into one CSV, checking that the headers match "
+                    "and dropping duplicate links."
+    )
+    parser.add_argument("output_file", help="e.g. data/aaai_papers.csv")
+    parser.add_argument("inputs", nargs="*",
+                        help="CSV files to merge (default: the output file's --shard outputs)")
+    args = parser.parse_args()
 
-out_file = "data/aaai_papers.csv"
-combine_csv_files(aaai_files, out_file)
\ No newline at end of file
+    inputs = args.inputs or shard.find_shards(args.output_file)
+    combine_csv_files(inputs, args.output_file)
@@ -0,0 +1,444 @@
+import argparse
+import asyncio
+import collections
+import concurrent.futures
+import html
+import json
+import os
+import random
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+import http.server
+from urllib.parse import urlparse, parse_qs
+
+# optional, only needed to serve over HTTP/2 (pip install hypercorn)
+try:
+    import hypercorn.asyncio
+    import hypercorn.config
+except ImportError:
+    hypercorn = None
+
+from bench_parse import padding
+
+ISSUES_PER_VENUE = 3
+AUTHORS_PER_PAPER = 4
+
+# half the topics contain a filter keyword, so roughly half the papers are kept
+TOPICS = [
+    "Algorithmic Fairness", "Differential Privacy", "Explainable AI", "Adversarial Attack",
+    "Graph Neural Networks", "Reinforcement Learning", "Protein Folding", "Speech Recognition",
+]
+
+
+class Profile:
+    """
+    How the mock server misbehaves: mean response latency and jitter in
+    seconds, the share of requests answered with a 503, and the number of
+    requests in flight above which it answers 429 (None for no limit).
+    """
+
+    def __init__(self, latency=0.0, jitter=0.0, error_rate=0.0, max_concurrency=None):
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.max_concurrency = max_concurrency
+
+
+PROFILES = {
+    "fast": Profile(),
+    "realistic": Profile(latency=0.2, jitter=0.1, error_rate=0.01, max_concurrency=32),
+    "hostile": Profile(latency=0.5, jitter=0.3, error_rate=0.05, max_concurrency=8),
+}
+
+
+def paper(key):
+    """
+    Deterministic synthetic paper for an id, so every request for it returns
+    the same page.
+    """
+    rng = random.Random(key)
+    topic = rng.choice(TOPICS)
+    authors = [f"Author {rng.randrange(1000)}" for _ in range(AUTHORS_PER_PAPER)]
+    return {
+        "title": f"{topic} at Scale ({key})",
+        "abstract": f"We study {topic.lower()} in large models.\nResults on {rng.randrange(10, 99)} benchmarks. " * 8,
+        "keywords": [topic, "Machine Learning"],
+        "authors": authors,
+        "profile_ids": [f"~{name.replace(' ', '_')}1" for name in authors],
+    }
+
+
+def ojs_archive(venue):
+    issues = "".join(
+        f'<h2><a class="title" href="/index.php/{venue}/issue/view/{n}">'
+        f"Vol. 1 No. {n}: {venue}-24 Technical Track {n}</a></h2>"
+        for n in range(1, ISSUES_PER_VENUE + 1)
+    )
+    return f"<html><body>{padding(50)}<div class=\"issues\">{issues}</div></body></html>"
+
+
+def ojs_issue(venue, issue, papers):
+    # root-relative links, so the page is right whichever address serves it
+    ids = range(issue - 1, papers, ISSUES_PER_VENUE)
+    items = "".join(
+        f'<div class="obj_article_summary"><h3 class="title">'
+        f'<a href="/index.php/{venue}/article/view/{i}">Paper {i}</a></h3></div>'
+        for i in ids
+    )
+    return f"<html><body>{padding(100)}{items}</body></html>"
+
+
+def ojs_article(venue, article_id):
+    p = paper(f"{venue}-{article_id}")
+    metas = "".join(
+        f'<meta name="citation_author" content="{name}">'
+        f'<meta name="citation_author_institution" content="University {i}">'
+        f'<meta name="citation_author_country" content="Country {i}">'
+        for i, name in enumerate(p["authors"])
+    )
+    return (
+        "<html><head>"
+        f'<meta name="citation_section" content="{venue} Technical Track">'
+        f'<meta name="citation_title" content="{html.escape(p["title"])}">{metas}'
+        f"</head><body>{padding(300)}"
+        f'<article><h1 class="page_title">{html.escape(p["title"])}</h1>'
+        '<section class="item abstract"><h2 class="label">Abstract</h2>'
+        f'<p>{html.escape(p["abstract"])}</p></section>'
+        '<section class="item keywords"><h2 class="label">Keywords:</h2>'
+        f'<span class="value">{", ".join(p["keywords"])}</span></section>'
+        f"</article>{padding(200)}</body></html>"
+    )
+
+
+def openreview_forum(forum_id):
+    p = paper(forum_id)
+    metas = "".join(f'<meta name="citation_author" content="{name}">' for name in p["authors"])
+    links = ", ".join(
+        f'<a href="/profile?id={profile_id}">{name}</a>'
+        for name, profile_id in zip(p["authors"], p["profile_ids"])
+    )
+    return (
+        "<html><head>"
+        f'<meta name="description" content="{html.escape(p["abstract"])}">{metas}'
+        f"</head><body>{padding(300)}"
+        f'<div class="forum-container"><h2 class="citation_title">{html.escape(p["title"])}</h2>'
+        f'<div class="forum-authors"><h3>{links}</h3></div>'
+        '<div class="note-content"><strong>Keywords:</strong> '
+        f'<span class="note-content-value">{", ".join(p["keywords"])}</span></div></div>'
+        f'<script id="__NEXT_DATA__" type="application/json">{{"x": "{"y" * 50000}"}}</script>'
+        "</body></html>"
+    )
+
+
+def openreview_profile(profile_id):
+    rng = random.Random(profile_id)
+    return (
+        f"<html><body>{padding(200)}"
+        f'<div class="profile-container"><h1>{html.escape(profile_id)}</h1>'
+        f'<div class="institution">University {rng.randrange(200)} (uni{rng.randrange(200)}.edu)</div></div>'
+        "</body></html>"
+    )
+
+
+def openreview_notes(venue_id, offset, limit, papers):
+    notes = []
+    for i in range(offset, min(papers, offset + limit)):
+        forum_id = f"{venue_id.split('.')[0]}-{i}"
+        p = paper(forum_id)
+        notes.append({
+            "id": forum_id,
+            "forum": forum_id,
+            "content": {
+                "title": {"value": p["title"]},
+                "abstract": {"value": p["abstract"]},
+                "authors": {"value": p["authors"]},
+                "authorids": {"value": p["profile_ids"]},
+                "keywords": {"value": p["keywords"]},
+            },
+        })
+    return {"notes": notes, "count": papers}
+
+
+def acm_landing(doi):
+    p = paper(doi)
+    authors = "".join(
+        f'<span property="author"><span property="givenName">{name.split()[0]}</span> '
+        f'<span property="familyName">{name.split()[1]}</span>'
+        f'<span property="affiliation"><span property="name">University {i}</span></span></span>'
+        for i, name in enumerate(p["authors"])
+    )
+    return (
+        f"<html><body>{padding(300)}"
+        f'<h1 property="name">{html.escape(p["title"])}</h1>{authors}'
+        f'<div class="abstractSection"><div role="paragraph">{html.escape(p["abstract"])}</div></div>'
+        f"{padding(200)}</body></html>"
+    )
+
+
+def acm_full_html(doi):
+    p = paper(doi)
+    keywords = "".join(f'<span class="keyword"><small>{kw}</small></span>' for kw in p["keywords"])
+    return (
+        f"<html><body>{padding(300)}{keywords}"
+        '<div class="CCSconcepts"><strong>Computing methodologies;</strong> '
+        "<strong>Machine learning;</strong></div>"
+        f"{padding(500)}</body></html>"
+    )
+
+
+class MockVenues:
+    """
+    Synthetic AAAI/AIES (OJS), OpenReview and ACM DL pages with the
+    structure the scrapers expect, served from one local port:
+      - /index.php/<AAAI|AIES>/issue/archive, /issue/view/<n>, /article/view/<id>
+      - /forum?id=, /profile?id= and the notes API at /notes
+      - /10.1145/<doi> (redirects like doi.org), /doi/10.1145/<doi>, /doi/fullHtml/10.1145/<doi>
+    Counts requests by kind so a benchmark can report requests per paper.
+    """
+
+    def __init__(self, profile=PROFILES["fast"], papers=100):
+        self.profile = profile
+        self.papers = papers
+        self.counts = collections.Counter()
+        self.in_flight = 0
+        self.lock = threading.Lock()
+        self.rng = random.Random(0)
+        self.base_url = ""
+
+    def route(self, path):
+        """
+        Returns (kind, status, content type, body, extra headers) for a GET.
+        """
+        url = urlparse(path)
+        parts = url.path.strip("/").split("/")
+        query = parse_qs(url.query)
+        if parts[0] == "index.php" and len(parts) >= 4:
+            venue = parts[1]
+            if parts[3] == "archive":
+                return "ojs", 200, "text/html", ojs_archive(venue), {}
+            if parts[2] == "issue" and len(parts) == 5:
+                return "ojs", 200, "text/html", ojs_issue(venue, int(parts[4]), self.papers), {}
+            if parts[2] == "article" and len(parts) == 5:
+                return "ojs", 200, "text/html", ojs_article(venue, parts[4]), {}
+        if parts[0] == "forum":
+            return "openreview", 200, "text/html", openreview_forum(query.get("id", [""])[0]), {}
+        if parts[0] == "profile":
+            return "openreview", 200, "text/html", openreview_profile(query.get("id", [""])[0]), {}
+        if parts[0] == "notes":
+            body = json.dumps(openreview_notes(
+                query.get("content.venueid", [""])[0],
+                int(query.get("offset", ["0"])[0]),
+                int(query.get("limit", ["1000"])[0]),
+                self.papers,
+            ))
+            return "openreview", 200, "application/json", body, {}
+        if parts[0] == "10.1145":
+            return "acm", 302, "text/html", "", {"Location": f"/doi/{url.path.strip('/')}"}
+        if parts[0] == "doi" and parts[1] == "fullHtml":
+            return "acm", 200, "text/html", acm_full_html(parts[-1]), {}
+        if parts[0] == "doi":
+            return "acm", 200, "text/html", acm_landing(parts[-1]), {}
+        return "other", 404, "text/plain", "not found", {}
+
+    def respond(self, path):
+        """
+        Answers a GET the way the profile says: after the profile's latency,
+        with a 429 above its concurrency limit or a random 503. Returns
+        (status, content type, body bytes, extra headers).
+        """
+        profile = self.profile
+        with self.lock:
+            self.in_flight += 1
+            throttled = profile.max_concurrency is not None and self.in_flight > profile.max_concurrency
+            failed = self.rng.random() < profile.error_rate
+            delay = max(0.0, self.rng.gauss(profile.latency, profile.jitter)) if profile.latency else 0.0
+        kind, status = "other", 500
+        try:
+            kind, status, content_type, body, headers = self.route(path)
+            if throttled:
+                status, body, headers = 429, "slow down", {"Retry-After": "1"}
+            elif failed:
+                status, body, headers = 503, "try again", {}
+            time.sleep(delay)
+            return status, content_type, body.encode("utf-8"), headers
+        finally:
+            with self.lock:
+                self.in_flight -= 1
+                self.counts[kind, status] += 1
+
+    def make_handler(self):
+        venues = self
+
+        class MockHandler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                status, content_type, data, headers = venues.respond(self.path)
+                self.send_response(status)
+                self.send_header("Content-Type", f"{content_type}; charset=utf-8")
+                self.send_header("Content-Length", str(len(data)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(data)
+
+            def log_message(self, format, *args):
+                pass
+
+        return MockHandler
+
+    def make_asgi_app(self, executor):
+        """
+        The same pages as an ASGI app, for serving over HTTP/2. Requests are
+        answered on executor's threads so the profile's latency doesn't
+        block the event loop.
+        """
+        venues = self
+
+        async def app(scope, receive, send):
+            if scope["type"] == "lifespan":
+                while True:
+                    message = await receive()
+                    if message["type"] == "lifespan.startup":
+                        await send({"type": "lifespan.startup.complete"})
+                    elif message["type"] == "lifespan.shutdown":
+                        await send({"type": "lifespan.shutdown.complete"})
+                        return
+            path = scope["raw_path"].decode("latin-1")
+            if scope["query_string"]:
+                path += "?" + scope["query_string"].decode("latin-1")
+            loop = asyncio.get_running_loop()
+            status, content_type, data, headers = await loop.run_in_executor(executor, venues.respond, path)
+            response_headers = [(b"content-type", f"{content_type}; charset=utf-8".encode()),
+                                (b"content-length", str(len(data)).encode())]
+            response_headers += [(name.lower().encode(), value.encode()) for name, value in headers.items()]
+            await send({"type": "http.response.start", "status": status, "headers": response_headers})
+            await send({"type": "http.response.body", "body": data})
+
+        return app
+
+    def requests(self, kind=None):
+        with self.lock:
+            return sum(n for (k, _), n in self.counts.items() if kind is None or k == kind)
+
+
+def serve(venues, port=0, address="127.0.0.1"):
+    """
+    Starts the mock server in a background thread and returns it; the base
+    URL is http://<address>:<server.server_address[1]>. The same venues can
+    be served on several loopback addresses, which the scrapers see as
+    separate hosts.
+    """
+    server = http.server.ThreadingHTTPServer((address, port), venues.make_handler())
+    server.daemon_threads = True
+    venues.base_url = f"http://{address}:{server.server_address[1]}"
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+class Http2Server:
+    """
+    The mock venues over TLS with HTTP/2 (and HTTP/1.1 for clients that
+    don't offer h2), run by hypercorn on its own event loop thread.
+    Needs hypercorn installed.
+    """
+
+    def __init__(self, venues, certfile, keyfile, port=0, workers=64):
+        if hypercorn is None:
+            raise RuntimeError("serving over HTTP/2 needs hypercorn (pip install hypercorn)")
+        if not port:
+            with socket.socket() as s:
+                s.bind(("127.0.0.1", 0))
+                port = s.getsockname()[1]
+        config = hypercorn.config.Config()
+        config.bind = [f"127.0.0.1:{port}"]
+        config.certfile = certfile
+        config.keyfile = keyfile
+        config.accesslog = None
+        config.errorlog = None
+        self.executor = concurrent.futures.ThreadPoolExecutor(max_workers=workers)
+        self.app = venues.make_asgi_app(self.executor)
+        self.config = config
+        self.loop = asyncio.new_event_loop()
+        self.stopped = asyncio.Event()
+        self.started = threading.Event()
+        venues.base_url = f"https://127.0.0.1:{port}"
+        threading.Thread(target=self._run, daemon=True).start()
+        self.started.wait(10)
+
+    def _run(self):
+        asyncio.set_event_loop(self.loop)
+        # scrapers exiting without a TLS close_notify are no reason for a traceback
+        self.loop.set_exception_handler(lambda loop, context: None)
+        self.loop.call_soon(self.started.set)
+        self.loop.run_until_complete(
+            hypercorn.asyncio.serve(self.app, self.config, shutdown_trigger=self.stopped.wait)
+        )
+
+    def shutdown(self):
+        self.loop.call_soon_threadsafe(self.stopped.set)
+        self.executor.shutdown(wait=False)
+
+
+def make_certificate(directory):
+    """
+    Writes a throwaway self-signed certificate for 127.0.0.1 into directory
+    with the openssl command line tool. Returns (certfile, keyfile).
+    """
+    certfile = os.path.join(directory, "cert.pem")
+    keyfile = os.path.join(directory, "key.pem")
+    subprocess.run(
+        ["openssl", "req", "-x509", "-newkey", "rsa:2048", "-nodes", "-days", "1",
+         "-keyout", keyfile, "-out", certfile, "-subj", "/CN=127.0.0.1",
+         "-addext", "subjectAltName=IP:127.0.0.1"],
+        check=True, capture_output=True,
+    )
+    return certfile, keyfile
+
+
+def add_profile_arguments(parser):
+    parser.add_argument("--profile", choices=sorted(PROFILES), default="fast")
+    parser.add_argument("--latency", type=float, help="mean response latency in seconds")
+    parser.add_argument("--jitter", type=float, help="latency standard deviation in seconds")
+    parser.add_argument("--error-rate", type=float, help="share of requests answered with a 503")
+    parser.add_argument("--max-concurrency", type=int, help="answer 429 above this many requests in flight")
+    parser.add_argument("--papers", type=int, default=100, help="papers per venue")
+
+
+def profile_from_args(args):
+    base = PROFILES[args.profile]
+    return Profile(
+        latency=base.latency if args.latency is None else args.latency,
+        jitter=base.jitter if args.jitter is None else args.jitter,
+        error_rate=base.error_rate if args.error_rate is None else args.error_rate,
+        max_concurrency=base.max_concurrency if args.max_concurrency is None else args.max_concurrency,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Local stand-in for the AAAI/AIES, OpenReview and ACM sites, with configurable "
+                    "latency, errors and throttling."
+    )
+    add_profile_arguments(parser)
+    parser.add_argument("--port", type=int, default=8780)
+    parser.add_argument("--http2", action="store_true",
+                        help="serve over TLS with HTTP/2 (needs hypercorn), with a throwaway certificate")
+    args = parser.parse_args()
+
+    venues = MockVenues(profile_from_args(args), args.papers)
+    if args.http2:
+        certfile, keyfile = make_certificate(tempfile.mkdtemp(prefix="mock_venues_"))
+        server = Http2Server(venues, certfile, keyfile, args.port)
+        print(f"Clients must trust {certfile}, e.g. SSL_CERT_FILE={certfile} REQUESTS_CA_BUNDLE={certfile}")
+    else:
+        server = serve(venues, args.port)
+    print(f"Serving mock venues at {venues.base_url}/ (profile {args.profile}, {args.papers} papers per venue)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
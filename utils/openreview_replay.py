@@ -0,0 +1,100 @@
+import argparse
+import glob
+import json
+import os
+import sys
+import http.server
+from urllib.parse import urlparse, parse_qs
+
+# shared modules live next to the scrapers in main/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main"))
+import http_client
+import openreview
+
+
+def record(venue_id, out_dir, api_url=openreview.API_URL, page_size=openreview.API_PAGE_SIZE):
+    """
+    Saves every notes API page for a venue as out_dir/notes_<offset>.json.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    offset = 0
+    while True:
+        response = http_client.get(
+            api_url + "notes",
+            params={"content.venueid": venue_id, "offset": offset, "limit": page_size},
+        )
+        response.raise_for_status()
+        page = response.json()
+        with open(os.path.join(out_dir, f"notes_{offset}.json"), "w", encoding="utf-8") as f:
+            json.dump(page, f)
+        notes = page.get("notes", [])
+        print(f"Recorded {len(notes)} notes at offset {offset}")
+        offset += len(notes)
+        if not notes or offset >= page.get("count", offset):
+            break
+
+
+def load_notes(record_dir):
+    notes = []
+    paths = glob.glob(os.path.join(record_dir, "notes_*.json"))
+    for path in sorted(paths, key=lambda p: int(os.path.basename(p)[6:-5])):
+        with open(path, "r", encoding="utf-8") as f:
+            notes.extend(json.load(f).get("notes", []))
+    return notes
+
+
+def make_handler(notes):
+    class ReplayHandler(http.server.BaseHTTPRequestHandler):
+        """
+        Answers GET /notes?offset=&limit= from the recorded notes, the way the
+        OpenReview API does, whatever page size they were recorded with.
+        """
+
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlparse(self.path)
+            if url.path.rstrip("/") != "/notes":
+                self.send_error(404)
+                return
+            query = parse_qs(url.query)
+            offset = int(query.get("offset", ["0"])[0])
+            limit = int(query.get("limit", [str(openreview.API_PAGE_SIZE)])[0])
+            body = json.dumps({"notes": notes[offset:offset + limit], "count": len(notes)}).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    return ReplayHandler
+
+
+def serve(record_dir, port=8765):
+    notes = load_notes(record_dir)
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", port), make_handler(notes))
+    print(f"Serving {len(notes)} recorded notes at http://127.0.0.1:{server.server_address[1]}/")
+    return server
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Record OpenReview notes API pages, or replay them as a local stand-in "
+                    "(run a scraper with --bulk --api-url http://127.0.0.1:8765/)."
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record")
+    record_parser.add_argument("venue_id")
+    record_parser.add_argument("record_dir")
+    serve_parser = subparsers.add_parser("serve")
+    serve_parser.add_argument("record_dir")
+    serve_parser.add_argument("--port", type=int, default=8765)
+    args = parser.parse_args()
+
+    if args.command == "record":
+        record(args.venue_id, args.record_dir)
+    else:
+        serve(args.record_dir, args.port).serve_forever()
@@ -1,25 +1,82 @@
+import argparse
+import os
+import sqlite3
+import sys
+import time
 import requests
 from bs4 import BeautifulSoup
 import concurrent.futures
 
+# shared modules live next to the scrapers in main/
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "main"))
+import aimd
+import http_client
+import openreview
+import retry
+
+# virtual conference sites, all running the same software
+SITES = {
+    "neurips": "https://nips.cc",
+    "icml": "https://icml.cc",
+    "iclr": "https://iclr.cc",
+}
+
+# paper pages already resolved to an OpenReview link, per venue and year
+RESOLVED_DIR = "cache/links"
+
+
+class ResolvedPages:
+    """
+    Remembers which virtual-site paper pages have been resolved to an
+    OpenReview link, so later runs only fetch pages they haven't seen.
+    Pages without a link are not recorded and are checked again next time.
+    """
+
+    def __init__(self, path):
+        if os.path.dirname(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+        self.conn = sqlite3.connect(path, timeout=30)
+        self.conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "page TEXT PRIMARY KEY, openreview_link TEXT NOT NULL, resolved_at REAL NOT NULL)"
+        )
+        self.conn.commit()
+
+    def resolved(self):
+        """
+        Returns {page: OpenReview link} for every page resolved so far.
+        """
+        return dict(self.conn.execute("SELECT page, openreview_link FROM pages"))
+
+    def put(self, page, openreview_link):
+        self.conn.execute(
+            "INSERT OR REPLACE INTO pages (page, openreview_link, resolved_at) VALUES (?, ?, ?)",
+            (page, openreview_link, time.time()),
+        )
+        self.conn.commit()
+
+    def close(self):
+        self.conn.close()
+
+
+def read_links(path):
+    """
+    Returns the links already saved in a links file, in file order.
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, "r", encoding="utf-8") as f:
+        return [line.strip() for line in f if line.strip()]
+
+
 def fetch_openreview_link(relative_link, base_url="https://nips.cc"):
     """
     Given a relative link, tries to find the OpenReview link on that page.
-    Returns the OpenReview link if found, otherwise None.
+    Returns the OpenReview link if found, otherwise None. Raises
+    requests.RequestException if the page still fails after retries.
     """
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/117.0.0.0 Safari/537.36"
-        )
-    }
-    try:
-        resp = requests.get(base_url + relative_link, headers=headers)
-        resp.raise_for_status()
-    except requests.RequestException as e:
-        print(f"Error fetching {base_url + relative_link}: {e}")
-        return None
+    resp = retry.get(base_url + relative_link, fetch=aimd.get)
+    resp.raise_for_status()
 
     soup = BeautifulSoup(resp.text, "html.parser")
     # The 'href_URL' button usually holds the OpenReview link.
@@ -29,60 +86,123 @@ def fetch_openreview_link(relative_link, base_url="https://nips.cc"):
 
     return None
 
-def save_openreview_links():
+
+def get_json_links(venue, year, base_url):
     """
-    Scrapes the main page for relative paper links, fetches each in parallel,
-    and writes the found OpenReview links to a file immediately.
+    OpenReview links from the virtual site's JSON listing of all orals and
+    posters, which costs one request instead of one per paper page. Returns
+    None if the site has no such listing or it carries no OpenReview links.
     """
-    url = "https://nips.cc/virtual/2024/papers.html?filter=titles"
-    headers = {
-        "User-Agent": (
-            "Mozilla/5.0 (Windows NT 10.0; Win64; x64) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/117.0.0.0 Safari/537.36"
-        )
-    }
+    url = f"{base_url}/static/virtual/data/{venue}-{year}-orals-posters.json"
+    try:
+        resp = retry.get(url)
+        resp.raise_for_status()
+        entries = resp.json().get("results", [])
+    except (requests.RequestException, ValueError) as e:
+        print(f"No JSON listing at {url} ({e}), falling back to paper pages.")
+        return None
+    links = [
+        entry.get("paper_url") for entry in entries
+        if "openreview.net/forum" in (entry.get("paper_url") or "")
+    ]
+    if not links:
+        print(f"JSON listing at {url} has no OpenReview links, falling back to paper pages.")
+        return None
+    print(f"Found {len(links)} OpenReview links in the JSON listing.")
+    return list(dict.fromkeys(links))
+
+
+def get_page_links(venue, year, base_url, resolved_pages):
+    """
+    OpenReview links from the individual paper pages on the virtual site,
+    fetching only the pages not resolved by an earlier run; links of pages
+    resolved before are taken from resolved_pages.
+    """
+    url = f"{base_url}/virtual/{year}/papers.html?filter=titles"
 
     # Fetch the main page.
     try:
-        resp = requests.get(url, headers=headers)
+        resp = retry.get(url)
         resp.raise_for_status()
     except requests.RequestException as e:
-        print(f"Error fetching the main NeurIPS page '{url}': {e}")
-        return
+        print(f"Error fetching the main {venue} page '{url}': {e}")
+        return []
 
     soup = BeautifulSoup(resp.text, "html.parser")
-    # Find all relative links that start with '/virtual/2024/'.
-    anchors = soup.select("li a[href^='/virtual/2024/']")
-    relative_links = [a.get("href") for a in anchors if a.get("href")]
-
-    print(f"Found {len(relative_links)} paper links on the main page.")
-    
-    # We'll keep track of how many links we've actually found.
-    found_count = 0
-
-    # Open the file once in 'w' mode. Each time we get a valid link, we'll write immediately.
-    with open("neurips_openreview_links.txt", "w", encoding="utf-8") as outfile:
-        # Use a thread pool to process links concurrently.
-        with concurrent.futures.ThreadPoolExecutor(max_workers=10) as executor:
+    # Find all relative links that start with '/virtual/<year>/'.
+    anchors = soup.select(f"li a[href^='/virtual/{year}/']")
+    relative_links = list(dict.fromkeys(a.get("href") for a in anchors if a.get("href")))
+    already_resolved = resolved_pages.resolved()
+    todo = [link for link in relative_links if link not in already_resolved]
+    print(f"Found {len(relative_links)} paper links on the main page, {len(todo)} not resolved before.")
+
+    found = [already_resolved[link] for link in relative_links if link in already_resolved]
+    # Use a thread pool to process links concurrently; the adaptive window
+    # in aimd decides how many requests are actually in flight. Pages that
+    # still fail after their retries get another pass at the end.
+    dead_letters = retry.DeadLetters()
+    while todo:
+        with concurrent.futures.ThreadPoolExecutor(max_workers=aimd.MAX_WINDOW) as executor:
             future_to_link = {
-                executor.submit(fetch_openreview_link, link): link
-                for link in relative_links
+                executor.submit(fetch_openreview_link, link, base_url): link
+                for link in todo
             }
             for future in concurrent.futures.as_completed(future_to_link):
                 link = future_to_link[future]
                 try:
                     result = future.result()
                     if result:
-                        found_count += 1
-                        outfile.write(result + "\n")
-                        # Flush each time so it's saved to disk immediately
-                        outfile.flush()
-                        print(f"Found OpenReview link for {link} (total so far: {found_count})")
-                except Exception as e:
-                    print(f"Error processing {link}: {e}")
+                        resolved_pages.put(link, result)
+                        found.append(result)
+                        print(f"Found OpenReview link for {link} (total so far: {len(found)})")
+                except requests.RequestException as e:
+                    retried = dead_letters.add(link, retry.host_of(base_url))
+                    print(f"Error processing {link}: {e}" + (" (will retry)" if retried else ""))
+        todo = dead_letters.requeue()
+    return found
+
+
+def save_openreview_links(venue="neurips", year=2024, output=None, use_json=True):
+    """
+    Brings links/<venue><year>_openreview_links.txt up to date for one
+    venue and year. Links already in the file are kept and only new ones are
+    appended, so a refresh mid-conference costs a handful of requests.
+    """
+    base_url = SITES[venue]
+    output = output or openreview.links_file(venue, year)
+    http_client.configure(max_workers=aimd.MAX_WINDOW)
+    # the listings change during a conference, so cached pages are always
+    # revalidated (unchanged ones cost a 304) instead of reused for a day
+    http_client.configure_cache(max_age=0)
+
+    existing = set(read_links(output))
+    links = get_json_links(venue, year, base_url) if use_json else None
+    if links is None:
+        resolved_pages = ResolvedPages(os.path.join(RESOLVED_DIR, f"{venue}_{year}.sqlite"))
+        links = get_page_links(venue, year, base_url, resolved_pages)
+        resolved_pages.close()
+
+    new_links = [link for link in dict.fromkeys(links) if link not in existing]
+    if os.path.dirname(output):
+        os.makedirs(os.path.dirname(output), exist_ok=True)
+    with open(output, "a", encoding="utf-8") as outfile:
+        for link in new_links:
+            outfile.write(link + "\n")
+
+    print(http_client.get_cache().summary())
+    print(f"Done. {len(new_links)} new OpenReview links appended to {output} ({len(existing) + len(new_links)} total).")
 
-    print(f"Done. A total of {found_count} OpenReview links were saved to neurips_openreview_links.txt.")
 
 if __name__ == "__main__":
-    save_openreview_links()
+    parser = argparse.ArgumentParser(
+        description="Collect a venue's OpenReview forum links from its virtual conference site, "
+                    "adding only links not already in the links file."
+    )
+    parser.add_argument("venue", nargs="?", choices=sorted(SITES), default="neurips")
+    parser.add_argument("--year", type=int, default=2024)
+    parser.add_argument("--output", help="links file to update (default: links/<venue><year>_openreview_links.txt)")
+    parser.add_argument("--no-json", action="store_true",
+                        help="always resolve links from the paper pages, ignoring any JSON listing")
+    args = parser.parse_args()
+
+    save_openreview_links(args.venue, args.year, args.output, use_json=not args.no_json)